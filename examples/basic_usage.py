@@ -9,10 +9,10 @@ This example demonstrates how to:
 """
 
 import asyncio
-import json
 import os
 import sys
 from pathlib import Path
+from typing import Optional
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -20,14 +20,56 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+# orjson is optional; it parses tool responses faster than the stdlib
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
-async def demonstrate_profile_info(session: ClientSession):
+# Resolve the server script once; sys.executable keeps the active interpreter
+_SERVER_SCRIPT = Path(__file__).resolve().parent.parent / "src" / "instagram_mcp_server.py"
+_SERVER_PARAMS = StdioServerParameters(
+    command=sys.executable,
+    args=[str(_SERVER_SCRIPT)]
+)
+
+_POST_FMT = (
+    "\n   Post {i}:\n"
+    "   ID: {id}\n"
+    "   Type: {media_type}\n"
+    "   Caption: {caption:.50}...\n"
+    "   Likes: {like_count:,}\n"
+    "   Comments: {comments_count:,}\n"
+    "   Posted: {timestamp}"
+)
+_POST_DEFAULTS = {
+    "caption": "No caption",
+    "like_count": 0,
+    "comments_count": 0,
+    "timestamp": "Unknown",
+}
+
+
+async def call_tools(session: ClientSession, specs):
+    """Issue independent tool calls concurrently over one session.
+    
+    The stdio transport is full-duplex JSON-RPC, so all requests are in
+    flight at once. Failed calls are returned as exceptions in place.
+    """
+    return await asyncio.gather(
+        *(session.call_tool(name, arguments) for name, arguments in specs),
+        return_exceptions=True
+    )
+
+
+def demonstrate_profile_info(result):
     """Demonstrate getting profile information."""
     print("\n🔍 Getting Instagram profile information...")
     
     try:
-        result = await session.call_tool("get_profile_info", {})
-        data = json.loads(result[0].text)
+        if isinstance(result, Exception):
+            raise result
+        data = json_loads(result[0].text)
         
         if data["success"]:
             profile = data["data"]
@@ -44,53 +86,53 @@ async def demonstrate_profile_info(session: ClientSession):
         print(f"❌ Error getting profile: {str(e)}")
 
 
-async def demonstrate_recent_posts(session: ClientSession):
-    """Demonstrate getting recent posts."""
+def demonstrate_recent_posts(result):
+    """Demonstrate getting recent posts.
+
+    Returns the retrieved posts so later demonstrations can reuse them.
+    """
     print("\n📸 Getting recent Instagram posts...")
     
     try:
-        result = await session.call_tool("get_media_posts", {"limit": 5})
-        data = json.loads(result[0].text)
+        if isinstance(result, Exception):
+            raise result
+        data = json_loads(result[0].text)
         
         if data["success"]:
             posts = data["data"]["posts"]
             print(f"✅ Retrieved {len(posts)} recent posts:")
             
             for i, post in enumerate(posts, 1):
-                print(f"\n   Post {i}:")
-                print(f"   ID: {post['id']}")
-                print(f"   Type: {post['media_type']}")
-                print(f"   Caption: {post.get('caption', 'No caption')[:50]}...")
-                print(f"   Likes: {post.get('like_count', 0):,}")
-                print(f"   Comments: {post.get('comments_count', 0):,}")
-                print(f"   Posted: {post.get('timestamp', 'Unknown')}")
+                # Posts are dumped with explicit nulls, so drop them before
+                # falling back to the defaults
+                fields = {k: v for k, v in post.items() if v is not None}
+                print(_POST_FMT.format(i=i, **{**_POST_DEFAULTS, **fields}))
+            
+            return posts
         else:
             print(f"❌ Failed to get posts: {data['error']}")
             
     except Exception as e:
         print(f"❌ Error getting posts: {str(e)}")
+    
+    return []
 
 
-async def demonstrate_media_insights(session: ClientSession):
-    """Demonstrate getting media insights."""
+async def demonstrate_media_insights(session: ClientSession, media_id: Optional[str]):
+    """Demonstrate getting media insights for an already retrieved post."""
     print("\n📊 Getting media insights...")
     
-    # First get a recent post to analyze
     try:
-        result = await session.call_tool("get_media_posts", {"limit": 1})
-        data = json.loads(result[0].text)
-        
-        if data["success"] and data["data"]["posts"]:
-            media_id = data["data"]["posts"][0]["id"]
+        if media_id:
             print(f"   Analyzing post: {media_id}")
             
             # Get insights for this post
             insights_result = await session.call_tool("get_media_insights", {
                 "media_id": media_id,
-                "metrics": ["impressions", "reach", "likes", "comments"]
+                "metrics": ["reach", "likes", "comments", "saved"]
             })
             
-            insights_data = json.loads(insights_result[0].text)
+            insights_data = json_loads(insights_result[0].text)
             
             if insights_data["success"]:
                 insights = insights_data["data"]["insights"]
@@ -110,16 +152,14 @@ async def demonstrate_media_insights(session: ClientSession):
         print(f"❌ Error getting insights: {str(e)}")
 
 
-async def demonstrate_account_insights(session: ClientSession):
+def demonstrate_account_insights(result):
     """Demonstrate getting account-level insights."""
     print("\n📈 Getting account insights...")
     
     try:
-        result = await session.call_tool("get_account_insights", {
-            "metrics": ["impressions", "reach", "profile_visits"],
-            "period": "day"
-        })
-        data = json.loads(result[0].text)
+        if isinstance(result, Exception):
+            raise result
+        data = json_loads(result[0].text)
         
         if data["success"]:
             insights = data["data"]["insights"]
@@ -141,18 +181,27 @@ async def demonstrate_resources(session: ClientSession):
     """Demonstrate accessing resources."""
     print("\n📋 Accessing Instagram resources...")
     
-    try:
-        # List available resources
-        resources = await session.list_resources()
+    # Listing and reading are independent, so issue both at once
+    resources, profile_content = await asyncio.gather(
+        session.list_resources(),
+        session.read_resource("instagram://profile"),
+        return_exceptions=True
+    )
+    
+    if isinstance(resources, Exception):
+        print(f"❌ Error listing resources: {str(resources)}")
+    else:
         print(f"✅ Available resources: {len(resources)}")
         
         for resource in resources:
             print(f"   • {resource.name}: {resource.description}")
-        
-        # Read profile resource
-        print("\n   Reading profile resource...")
-        profile_content = await session.read_resource("instagram://profile")
-        profile_data = json.loads(profile_content)
+    
+    # Read profile resource
+    print("\n   Reading profile resource...")
+    try:
+        if isinstance(profile_content, Exception):
+            raise profile_content
+        profile_data = json_loads(profile_content)
         
         if "error" not in profile_data:
             print(f"   ✅ Profile resource loaded successfully")
@@ -161,43 +210,49 @@ async def demonstrate_resources(session: ClientSession):
             print(f"   ❌ Error reading profile resource: {profile_data['error']}")
             
     except Exception as e:
-        print(f"❌ Error accessing resources: {str(e)}")
+        print(f"❌ Error reading profile resource: {str(e)}")
 
 
 async def demonstrate_prompts(session: ClientSession):
     """Demonstrate using prompts."""
     print("\n💬 Using Instagram prompts...")
     
-    try:
-        # List available prompts
-        prompts = await session.list_prompts()
+    # Listing prompts and generating one are independent, so overlap them
+    prompts, strategy_prompt = await asyncio.gather(
+        session.list_prompts(),
+        session.get_prompt("content_strategy", {
+            "focus_area": "engagement",
+            "time_period": "week"
+        }),
+        return_exceptions=True
+    )
+    
+    if isinstance(prompts, Exception):
+        print(f"❌ Error listing prompts: {str(prompts)}")
+    else:
         print(f"✅ Available prompts: {len(prompts)}")
         
         for prompt in prompts:
             print(f"   • {prompt.name}: {prompt.description}")
-        
-        # Use content strategy prompt
-        print("\n   Generating content strategy prompt...")
-        strategy_prompt = await session.get_prompt("content_strategy", {
-            "focus_area": "engagement",
-            "time_period": "week"
-        })
-        
+    
+    # Use content strategy prompt
+    print("\n   Generating content strategy prompt...")
+    if isinstance(strategy_prompt, Exception):
+        print(f"❌ Error using prompts: {str(strategy_prompt)}")
+    else:
         print(f"   ✅ Content strategy prompt generated")
         print(f"      Length: {len(strategy_prompt)} characters")
         print(f"      Preview: {strategy_prompt[:200]}...")
-        
-    except Exception as e:
-        print(f"❌ Error using prompts: {str(e)}")
 
 
-async def validate_token(session: ClientSession):
+def validate_token(result):
     """Validate the access token."""
     print("\n🔐 Validating Instagram access token...")
     
     try:
-        result = await session.call_tool("validate_access_token", {})
-        data = json.loads(result[0].text)
+        if isinstance(result, Exception):
+            raise result
+        data = json_loads(result[0].text)
         
         if data["success"]:
             is_valid = data["data"]["valid"]
@@ -222,42 +277,64 @@ async def main():
     print("🚀 Instagram MCP Server - Basic Usage Example")
     print("=" * 50)
     
-    # Set up server parameters
-    server_script = Path(__file__).parent.parent / "src" / "instagram_mcp_server.py"
-    
-    if not server_script.exists():
-        print(f"❌ Server script not found: {server_script}")
+    if not _SERVER_SCRIPT.exists():
+        print(f"❌ Server script not found: {_SERVER_SCRIPT}")
         print("   Make sure you're running this from the project root directory")
         return
     
-    server_params = StdioServerParameters(
-        command="python",
-        args=[str(server_script)]
-    )
-    
     try:
         # Connect to the MCP server
         print("🔌 Connecting to Instagram MCP server...")
         
-        async with stdio_client(server_params) as (read, write):
+        async with stdio_client(_SERVER_PARAMS) as (read, write):
             async with ClientSession(read, write) as session:
                 # Initialize the session
                 await session.initialize()
                 print("✅ Connected to Instagram MCP server!")
                 
-                # Validate token first
-                if not await validate_token(session):
+                # Token validation and the independent tools share one
+                # round trip window
+                token, profile, recent_posts, account_insights = await call_tools(
+                    session,
+                    [
+                        ("validate_access_token", {}),
+                        ("get_profile_info", {}),
+                        ("get_media_posts", {
+                            "limit": 5,
+                            "fields": [
+                                "id", "media_type", "caption", "like_count",
+                                "comments_count", "timestamp"
+                            ]
+                        }),
+                        ("get_account_insights", {
+                            "metrics": ["reach", "profile_views", "accounts_engaged"],
+                            "period": "day"
+                        }),
+                    ]
+                )
+                
+                if not validate_token(token):
                     print("\n❌ Cannot proceed without valid access token")
                     print("   Please check your Instagram API credentials in .env file")
                     return
                 
-                # Run demonstrations
-                await demonstrate_profile_info(session)
-                await demonstrate_recent_posts(session)
-                await demonstrate_media_insights(session)
-                await demonstrate_account_insights(session)
-                await demonstrate_resources(session)
-                await demonstrate_prompts(session)
+                demonstrate_profile_info(profile)
+                posts = demonstrate_recent_posts(recent_posts)
+                demonstrate_account_insights(account_insights)
+                
+                # Media insights reuses the posts fetched above instead of
+                # issuing its own discovery call
+                media_id = posts[0]["id"] if posts else None
+                demos = [
+                    demonstrate_media_insights(session, media_id),
+                    demonstrate_resources(session),
+                    demonstrate_prompts(session),
+                ]
+                results = await asyncio.gather(*demos, return_exceptions=True)
+                
+                for result in results:
+                    if isinstance(result, Exception):
+                        print(f"❌ Demonstration failed: {str(result)}")
                 
                 print("\n🎉 All demonstrations completed successfully!")
                 print("\nNext steps:")
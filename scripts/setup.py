@@ -9,33 +9,83 @@ This script helps users configure their Instagram MCP server by:
 4. Generating MCP client configuration
 """
 
-import os
 import sys
 import asyncio
+import argparse
+import hashlib
 import json
+import time
+from collections import ChainMap
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 import httpx
-from rich.console import Console
+from rich.console import Console, Group
 from rich.prompt import Prompt, Confirm
-from rich.panel import Panel
-from rich.text import Text
-from rich.table import Table
 
 console = Console()
 
+# Defaults for settings the user may skip during setup
+DEFAULTS = {
+    "INSTAGRAM_API_VERSION": "v19.0",
+    "RATE_LIMIT_REQUESTS_PER_HOUR": "200",
+    "LOG_LEVEL": "INFO",
+    "CACHE_ENABLED": "true",
+    "CACHE_TTL_SECONDS": "300",
+}
+
+ENV_TEMPLATE = """# Instagram MCP Server Configuration
+# Generated by setup script
+
+# Instagram API Configuration
+INSTAGRAM_ACCESS_TOKEN={INSTAGRAM_ACCESS_TOKEN}
+FACEBOOK_APP_ID={FACEBOOK_APP_ID}
+FACEBOOK_APP_SECRET={FACEBOOK_APP_SECRET}
+{BUSINESS_ACCOUNT_LINE}
+# API Configuration
+INSTAGRAM_API_VERSION={INSTAGRAM_API_VERSION}
+INSTAGRAM_API_BASE_URL=https://graph.facebook.com
+
+# Rate Limiting Configuration
+RATE_LIMIT_REQUESTS_PER_HOUR={RATE_LIMIT_REQUESTS_PER_HOUR}
+RATE_LIMIT_POSTS_PER_DAY=25
+RATE_LIMIT_ENABLE_BACKOFF=true
+
+# Logging Configuration
+LOG_LEVEL={LOG_LEVEL}
+LOG_FORMAT=json
+LOG_FILE=logs/instagram_mcp.log
+
+# Cache Configuration
+CACHE_ENABLED={CACHE_ENABLED}
+CACHE_TTL_SECONDS={CACHE_TTL_SECONDS}
+
+# MCP Server Configuration
+MCP_SERVER_NAME=instagram-mcp-server
+MCP_SERVER_VERSION=1.0.0
+MCP_TRANSPORT=stdio"""
+
+# Cached validation responses, keyed by a hash of the access token
+CACHE_FILE = Path(__file__).parent / ".setup_cache.json"
+
 
 class InstagramSetup:
     """Instagram MCP Server setup helper."""
     
-    def __init__(self):
+    def __init__(self, force_refresh: bool = False):
         self.config = {}
+        # Collected values first, falling back to DEFAULTS
+        self._resolved = ChainMap(self.config, DEFAULTS)
         self.project_root = Path(__file__).parent.parent
         self.env_file = self.project_root / ".env"
+        self.force_refresh = force_refresh
+        self._http: Optional[httpx.AsyncClient] = None
+        self._cached = set()
     
     def welcome(self):
         """Display welcome message."""
+        from rich.panel import Panel
+        
         console.print(Panel.fit(
             "[bold blue]Instagram MCP Server Setup[/bold blue]\n\n"
             "This setup wizard will help you configure your Instagram MCP server\n"
@@ -46,12 +96,14 @@ class InstagramSetup:
     
     def collect_credentials(self):
         """Collect Instagram API credentials from user."""
-        console.print("\n[bold yellow]Step 1: Instagram API Credentials[/bold yellow]")
-        console.print("You'll need the following from your Facebook Developer account:")
-        console.print("• Facebook App ID")
-        console.print("• Facebook App Secret")
-        console.print("• Long-lived Instagram Access Token")
-        console.print("• Instagram Business Account ID (optional)")
+        console.print(
+            "\n[bold yellow]Step 1: Instagram API Credentials[/bold yellow]\n"
+            "You'll need the following from your Facebook Developer account:\n"
+            "• Facebook App ID\n"
+            "• Facebook App Secret\n"
+            "• Long-lived Instagram Access Token\n"
+            "• Instagram Business Account ID (optional)"
+        )
         
         self.config["FACEBOOK_APP_ID"] = Prompt.ask(
             "\nEnter your Facebook App ID",
@@ -117,118 +169,133 @@ class InstagramSetup:
         console.print("\n[bold yellow]Step 3: Validating Credentials[/bold yellow]")
         
         with console.status("[bold green]Testing Instagram API connection..."):
-            try:
-                # Test basic API access
-                url = f"https://graph.facebook.com/v19.0/me"
-                params = {
-                    "access_token": self.config["INSTAGRAM_ACCESS_TOKEN"],
-                    "fields": "id,name"
-                }
-                
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(url, params=params)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        console.print(f"✅ API connection successful!")
-                        console.print(f"   Connected as: {data.get('name', 'Unknown')}")
-                        console.print(f"   User ID: {data.get('id', 'Unknown')}")
-                        
-                        # Test Instagram Business Account access if provided
-                        if "INSTAGRAM_BUSINESS_ACCOUNT_ID" in self.config:
-                            await self._test_instagram_account()
-                        
-                        return True
-                    else:
-                        error_data = response.json()
-                        console.print(f"❌ API connection failed: {error_data}")
-                        return False
-                        
-            except Exception as e:
-                console.print(f"❌ Connection error: {str(e)}")
-                return False
-    
-    async def _test_instagram_account(self):
-        """Test Instagram Business Account access."""
-        try:
-            account_id = self.config["INSTAGRAM_BUSINESS_ACCOUNT_ID"]
-            url = f"https://graph.facebook.com/v19.0/{account_id}"
-            params = {
-                "access_token": self.config["INSTAGRAM_ACCESS_TOKEN"],
-                "fields": "id,username,name,followers_count"
-            }
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    console.print(f"✅ Instagram Business Account access successful!")
-                    console.print(f"   Account: @{data.get('username', 'Unknown')}")
-                    console.print(f"   Name: {data.get('name', 'Unknown')}")
-                    console.print(f"   Followers: {data.get('followers_count', 'Unknown')}")
-                else:
-                    console.print(f"⚠️  Instagram Business Account access failed")
-                    console.print("   You can still use the server, but some features may be limited")
-                    
-        except Exception as e:
-            console.print(f"⚠️  Instagram account test error: {str(e)}")
-    
-    def save_env_file(self):
-        """Save configuration to .env file."""
-        console.print("\n[bold yellow]Step 4: Saving Configuration[/bold yellow]")
-        
-        env_content = []
-        env_content.append("# Instagram MCP Server Configuration")
-        env_content.append("# Generated by setup script\n")
-        
-        # Instagram API Configuration
-        env_content.append("# Instagram API Configuration")
-        for key in ["INSTAGRAM_ACCESS_TOKEN", "FACEBOOK_APP_ID", "FACEBOOK_APP_SECRET", "INSTAGRAM_BUSINESS_ACCOUNT_ID"]:
-            if key in self.config:
-                env_content.append(f"{key}={self.config[key]}")
-        
-        env_content.append("")
+            # Both lookups only read with the same token, so run them together
+            me_result, ig_result = await asyncio.gather(
+                self._get_me(),
+                self._get_ig_account(),
+                return_exceptions=True
+            )
         
-        # API Configuration
-        env_content.append("# API Configuration")
-        env_content.append(f"INSTAGRAM_API_VERSION={self.config.get('INSTAGRAM_API_VERSION', 'v19.0')}")
-        env_content.append("INSTAGRAM_API_BASE_URL=https://graph.facebook.com")
+        if isinstance(me_result, Exception):
+            console.print(f"❌ Connection error: {str(me_result)}")
+            return False
         
-        env_content.append("")
+        ok, data = me_result
+        if not ok:
+            console.print(f"❌ API connection failed: {data}")
+            return False
         
-        # Rate Limiting
-        env_content.append("# Rate Limiting Configuration")
-        env_content.append(f"RATE_LIMIT_REQUESTS_PER_HOUR={self.config.get('RATE_LIMIT_REQUESTS_PER_HOUR', '200')}")
-        env_content.append("RATE_LIMIT_POSTS_PER_DAY=25")
-        env_content.append("RATE_LIMIT_ENABLE_BACKOFF=true")
+        console.print(f"✅ API connection successful!{self._cached_tag('me')}")
+        console.print(f"   Connected as: {data.get('name', 'Unknown')}")
+        console.print(f"   User ID: {data.get('id', 'Unknown')}")
         
-        env_content.append("")
+        # Report Instagram Business Account access if provided
+        if "INSTAGRAM_BUSINESS_ACCOUNT_ID" in self.config:
+            self._show_instagram_account(ig_result)
         
-        # Logging
-        env_content.append("# Logging Configuration")
-        env_content.append(f"LOG_LEVEL={self.config.get('LOG_LEVEL', 'INFO')}")
-        env_content.append("LOG_FORMAT=json")
-        env_content.append("LOG_FILE=logs/instagram_mcp.log")
+        return True
+    
+    async def _get_me(self):
+        """Fetch the user behind the access token as an (ok, data) tuple."""
+        url = f"https://graph.facebook.com/v19.0/me"
+        params = {
+            "access_token": self.config["INSTAGRAM_ACCESS_TOKEN"],
+            "fields": "id,name"
+        }
         
-        env_content.append("")
+        return await self._cached_get("me", url, params)
+    
+    async def _get_ig_account(self):
+        """Fetch the Instagram Business Account as an (ok, data) tuple."""
+        account_id = self.config.get("INSTAGRAM_BUSINESS_ACCOUNT_ID")
+        if not account_id:
+            return False, None
+        
+        url = f"https://graph.facebook.com/v19.0/{account_id}"
+        params = {
+            "access_token": self.config["INSTAGRAM_ACCESS_TOKEN"],
+            "fields": "id,username,name,followers_count"
+        }
         
-        # Cache
-        env_content.append("# Cache Configuration")
-        env_content.append(f"CACHE_ENABLED={self.config.get('CACHE_ENABLED', 'true')}")
-        env_content.append(f"CACHE_TTL_SECONDS={self.config.get('CACHE_TTL_SECONDS', '300')}")
+        return await self._cached_get(f"ig:{account_id}", url, params)
+    
+    async def _cached_get(self, name: str, url: str, params: Dict[str, Any]):
+        """GET a Graph API URL, reusing a recent successful response if cached.
+        
+        Only successful responses are cached, and the access token is stored
+        as a SHA-256 hash so the cache file never contains the token itself.
+        """
+        token_hash = hashlib.sha256(
+            self.config["INSTAGRAM_ACCESS_TOKEN"].encode("utf-8")
+        ).hexdigest()
+        ttl = int(self._resolved["CACHE_TTL_SECONDS"])
+        use_cache = self._resolved["CACHE_ENABLED"] == "true"
+        
+        if use_cache and not self.force_refresh:
+            entry = self._load_cache().get(token_hash, {}).get(name)
+            if entry and time.time() - entry["ts"] < ttl:
+                self._cached.add(name)
+                return True, entry["data"]
+        
+        response = await self._http.get(url, params=params)
+        ok = response.status_code == 200
+        data = response.json()
+        
+        if ok and use_cache:
+            cache = self._load_cache()
+            cache.setdefault(token_hash, {})[name] = {"data": data, "ts": time.time()}
+            try:
+                CACHE_FILE.write_text(json.dumps(cache), encoding="utf-8")
+            except OSError:
+                pass
         
-        env_content.append("")
+        return ok, data
+    
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load the validation cache, treating unreadable files as empty."""
+        try:
+            return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+    
+    def _cached_tag(self, name: str) -> str:
+        """Return a marker for responses served from the validation cache."""
+        return " [dim](cached)[/dim]" if name in self._cached else ""
+    
+    def _show_instagram_account(self, result):
+        """Report Instagram Business Account access."""
+        if isinstance(result, Exception):
+            console.print(f"⚠️  Instagram account test error: {str(result)}")
+            return
+        
+        ok, data = result
+        if ok:
+            account_id = self.config["INSTAGRAM_BUSINESS_ACCOUNT_ID"]
+            console.print(
+                f"✅ Instagram Business Account access successful!"
+                f"{self._cached_tag(f'ig:{account_id}')}"
+            )
+            console.print(f"   Account: @{data.get('username', 'Unknown')}")
+            console.print(f"   Name: {data.get('name', 'Unknown')}")
+            console.print(f"   Followers: {data.get('followers_count', 'Unknown')}")
+        else:
+            console.print(f"⚠️  Instagram Business Account access failed")
+            console.print("   You can still use the server, but some features may be limited")
+    
+    async def save_env_file(self):
+        """Save configuration to .env file."""
+        console.print("\n[bold yellow]Step 4: Saving Configuration[/bold yellow]")
         
-        # MCP Server
-        env_content.append("# MCP Server Configuration")
-        env_content.append("MCP_SERVER_NAME=instagram-mcp-server")
-        env_content.append("MCP_SERVER_VERSION=1.0.0")
-        env_content.append("MCP_TRANSPORT=stdio")
+        account_id = self.config.get("INSTAGRAM_BUSINESS_ACCOUNT_ID")
+        values = ChainMap({
+            "BUSINESS_ACCOUNT_LINE": (
+                f"INSTAGRAM_BUSINESS_ACCOUNT_ID={account_id}\n" if account_id else ""
+            )
+        }, self._resolved)
         
-        # Write to file
-        with open(self.env_file, "w") as f:
-            f.write("\n".join(env_content))
+        await asyncio.to_thread(
+            self.env_file.write_text, ENV_TEMPLATE.format_map(values)
+        )
         
         console.print(f"✅ Configuration saved to {self.env_file}")
     
@@ -247,7 +314,7 @@ class InstagramSetup:
                         "INSTAGRAM_ACCESS_TOKEN": self.config["INSTAGRAM_ACCESS_TOKEN"],
                         "FACEBOOK_APP_ID": self.config["FACEBOOK_APP_ID"],
                         "FACEBOOK_APP_SECRET": self.config["FACEBOOK_APP_SECRET"],
-                        "LOG_LEVEL": self.config.get("LOG_LEVEL", "INFO")
+                        "LOG_LEVEL": self._resolved["LOG_LEVEL"]
                     }
                 }
             }
@@ -259,19 +326,20 @@ class InstagramSetup:
         config_file = self.project_root / "config" / "mcp_client_config.json"
         config_file.parent.mkdir(exist_ok=True)
         
-        with open(config_file, "w") as f:
-            json.dump(mcp_config, f, indent=2)
+        serialized = json.dumps(mcp_config, indent=2, ensure_ascii=False)
+        config_file.write_text(serialized, encoding="utf-8")
         
         console.print(f"✅ MCP client configuration saved to {config_file}")
         
         # Show usage instructions
         console.print("\n[bold green]Setup Complete![/bold green]")
         console.print("\nTo use with Claude Desktop, add this to your Claude config:")
-        console.print(f"[dim]{json.dumps(mcp_config, indent=2)}[/dim]")
+        console.print(f"[dim]{serialized}[/dim]")
     
     def show_next_steps(self):
         """Show next steps to the user."""
-        console.print("\n[bold blue]Next Steps:[/bold blue]")
+        from rich.table import Table
+        from rich.text import Text
         
         table = Table(show_header=False, box=None)
         table.add_column("Step", style="bold yellow")
@@ -282,12 +350,17 @@ class InstagramSetup:
         table.add_row("3.", "Configure your MCP client (Claude Desktop, etc.)")
         table.add_row("4.", "Start using Instagram tools in your AI conversations!")
         
-        console.print(table)
-        
-        console.print("\n[bold green]Documentation:[/bold green]")
-        console.print("• README.md - Complete setup and usage guide")
-        console.print("• config/mcp_client_config.json - MCP client configuration")
-        console.print("• .env - Environment variables")
+        # Render everything in one print to avoid per-line console flushes
+        console.print(Group(
+            Text.from_markup("\n[bold blue]Next Steps:[/bold blue]"),
+            table,
+            Text.from_markup(
+                "\n[bold green]Documentation:[/bold green]\n"
+                "• README.md - Complete setup and usage guide\n"
+                "• config/mcp_client_config.json - MCP client configuration\n"
+                "• .env - Environment variables"
+            )
+        ))
     
     async def run(self):
         """Run the setup process."""
@@ -297,14 +370,24 @@ class InstagramSetup:
             self.collect_credentials()
             self.collect_settings()
             
-            # Validate credentials
-            is_valid = await self.validate_credentials()
+            # Validate credentials, sharing one connection pool across calls
+            async with httpx.AsyncClient(
+                http2=True,
+                timeout=10.0,
+                limits=httpx.Limits(
+                    max_keepalive_connections=10,
+                    max_connections=20,
+                    keepalive_expiry=30.0
+                )
+            ) as self._http:
+                is_valid = await self.validate_credentials()
+            
             if not is_valid:
                 if not Confirm.ask("Credentials validation failed. Continue anyway?"):
                     console.print("Setup cancelled.")
                     return
             
-            self.save_env_file()
+            await self.save_env_file()
             self.generate_mcp_config()
             self.show_next_steps()
             
@@ -317,7 +400,15 @@ class InstagramSetup:
 
 async def main():
     """Main entry point."""
-    setup = InstagramSetup()
+    parser = argparse.ArgumentParser(description="Instagram MCP Server setup")
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="Ignore cached credential validation results"
+    )
+    args = parser.parse_args()
+    
+    setup = InstagramSetup(force_refresh=args.force_refresh)
     await setup.run()
 
 
@@ -3,13 +3,48 @@
 Setup script for Instagram MCP Server.
 """
 
+import functools
+import os
+from pathlib import Path
+
 from setuptools import setup, find_packages
 
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
 
-with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+@functools.lru_cache(maxsize=1)
+def _load_readme():
+    return Path("README.md").read_text(encoding="utf-8")
+
+
+@functools.lru_cache(maxsize=1)
+def _load_reqs():
+    return [
+        s
+        for ln in Path("requirements.txt").read_text(encoding="utf-8").splitlines()
+        if (s := ln.split("#", 1)[0].strip())
+    ]
+
+
+def _ext_modules():
+    """Optionally compile startup-critical and model modules with Cython.
+
+    Opt in with INSTAGRAM_MCP_CYTHONIZE=1. The pure-Python modules are
+    used whenever the variable is unset or Cython is not installed.
+    """
+    if os.environ.get("INSTAGRAM_MCP_CYTHONIZE") != "1":
+        return []
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        return []
+    return cythonize(
+        ["src/config.py", "src/models/instagram_models.py"],
+        compiler_directives={
+            "language_level": 3,
+            "binding": True,  # pydantic introspects validator signatures
+            "boundscheck": False,
+        },
+    )
+
 
 setup(
     name="instagram-mcp-server",
@@ -17,7 +52,7 @@ setup(
     author="José Luis Badano",
     author_email="",
     description="A Model Context Protocol server for Instagram API integration",
-    long_description=long_description,
+    long_description=_load_readme(),
     long_description_content_type="text/markdown",
     url="https://github.com/jlbadano/ig-mcp",
     packages=find_packages(),
@@ -35,7 +70,7 @@ setup(
         "Topic :: Communications :: Chat",
     ],
     python_requires=">=3.10",
-    install_requires=requirements,
+    install_requires=_load_reqs(),
     extras_require={
         "dev": [
             "pytest>=7.0.0",
@@ -51,13 +86,18 @@ setup(
             "safety>=2.3.0",
             "memory-profiler>=0.60.0",
             "locust>=2.15.0",
-        ]
+        ],
+        "fast": [
+            "orjson>=3.9.0",
+            "ciso8601>=2.3.0",
+        ],
     },
     entry_points={
         "console_scripts": [
             "instagram-mcp-server=src.instagram_mcp_server:main",
         ],
     },
+    ext_modules=_ext_modules(),
     include_package_data=True,
     package_data={
         "": ["*.md", "*.txt", "*.yml", "*.yaml", "*.json"],
@@ -2,161 +2,271 @@
 Configuration management for Instagram MCP Server.
 """
 
+import os
+import re
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, List, Optional
 
-from pydantic import ConfigDict, Field, field_validator
-from pydantic_settings import BaseSettings
+from pydantic import ConfigDict, Field, PrivateAttr, field_validator
 
+if TYPE_CHECKING:
+    from pydantic_settings import BaseSettings
 
-class InstagramMCPSettings(BaseSettings):
-    """Instagram MCP Server configuration settings."""
-
-    model_config = ConfigDict(
-        env_file=".env", env_file_encoding="utf-8", case_sensitive=False
+_VALID_LOG_LEVELS = frozenset(
+    map(sys.intern, ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"))
+)
+_VALID_LOG_FORMATS = frozenset(map(sys.intern, ("json", "text")))
+_CSV_SPLIT = re.compile(r"\s*,\s*").split
+# Under the optional Cython build, methods are cyfunctions rather than plain
+# functions; pydantic must be told to skip them when collecting fields
+_FUNCTION_TYPE = type(lambda: None)
+# Plain string settings without validators, safe to set without validation
+_FAST_LOAD_FIELDS = frozenset(
+    (
+        "instagram_access_token",
+        "facebook_app_id",
+        "facebook_app_secret",
+        "instagram_business_account_id",
+        "instagram_api_base_url",
+        "log_file",
+        "redis_url",
+        "mcp_server_name",
+        "mcp_server_version",
+        "mcp_transport",
+        "database_url",
+        "webhook_verify_token",
+        "webhook_secret",
+        "webhook_url",
     )
+)
+_REQUIRED_FIELDS = ("instagram_access_token", "facebook_app_id", "facebook_app_secret")
 
-    # Instagram API Configuration
-    instagram_access_token: str = Field(..., description="Instagram access token")
-    facebook_app_id: str = Field(..., description="Facebook app ID")
-    facebook_app_secret: str = Field(..., description="Facebook app secret")
-    instagram_business_account_id: Optional[str] = Field(
-        None, description="Instagram business account ID"
-    )
 
-    # API Configuration
-    instagram_api_version: str = Field("v19.0", description="Instagram API version")
-    instagram_api_base_url: str = Field(
-        "https://graph.facebook.com", description="Instagram API base URL"
-    )
+@lru_cache(maxsize=1)
+def _settings_class():
+    """Build the settings model on first use.
 
-    # Rate Limiting Configuration
-    rate_limit_requests_per_hour: int = Field(
-        200, description="Rate limit requests per hour"
-    )
-    rate_limit_posts_per_day: int = Field(25, description="Rate limit posts per day")
-    rate_limit_enable_backoff: bool = Field(
-        True, description="Enable rate limit backoff"
-    )
+    pydantic_settings is comparatively slow to import, so it is deferred
+    until settings are actually needed.
+    """
+    from pydantic_settings import BaseSettings
 
-    # Logging Configuration
-    log_level: str = Field("INFO", description="Log level")
-    log_format: str = Field("json", description="Log format")
-    log_file: Optional[str] = Field(
-        "logs/instagram_mcp.log", description="Log file path"
-    )
+    class InstagramMCPSettings(BaseSettings):
+        """Instagram MCP Server configuration settings."""
 
-    # Cache Configuration
-    cache_enabled: bool = Field(True, description="Enable caching")
-    cache_ttl_seconds: int = Field(300, description="Cache TTL in seconds")
-    redis_url: Optional[str] = Field(
-        "redis://localhost:6379/0", description="Redis URL"
-    )
+        model_config = ConfigDict(
+            env_file=".env",
+            env_file_encoding="utf-8",
+            case_sensitive=False,
+            frozen=True,
+            extra="ignore",
+            ignored_types=(_FUNCTION_TYPE,),
+        )
 
-    # Security Configuration
-    enable_request_validation: bool = Field(
-        True, description="Enable request validation"
-    )
-    max_request_size_mb: int = Field(10, description="Max request size in MB")
-    allowed_image_formats: List[str] = Field(
-        ["jpg", "jpeg", "png", "gif"], description="Allowed image formats"
-    )
-    allowed_video_formats: List[str] = Field(
-        ["mp4", "mov"], description="Allowed video formats"
-    )
+        # Instagram API Configuration
+        instagram_access_token: str = Field(..., description="Instagram access token")
+        facebook_app_id: str = Field(..., description="Facebook app ID")
+        facebook_app_secret: str = Field(..., description="Facebook app secret")
+        instagram_business_account_id: Optional[str] = Field(
+            None, description="Instagram business account ID"
+        )
 
-    # Development Configuration
-    debug_mode: bool = Field(False, description="Debug mode")
-    mock_api_responses: bool = Field(False, description="Mock API responses")
-    enable_metrics: bool = Field(True, description="Enable metrics")
+        # API Configuration
+        instagram_api_version: str = Field("v19.0", description="Instagram API version")
+        instagram_api_base_url: str = Field(
+            "https://graph.facebook.com", description="Instagram API base URL"
+        )
 
-    # MCP Server Configuration
-    mcp_server_name: str = Field("instagram-mcp-server", description="MCP server name")
-    mcp_server_version: str = Field("1.0.0", description="MCP server version")
-    mcp_transport: str = Field("stdio", description="MCP transport")
+        # Rate Limiting Configuration
+        rate_limit_requests_per_hour: int = Field(
+            200, description="Rate limit requests per hour"
+        )
+        rate_limit_posts_per_day: int = Field(
+            25, description="Rate limit posts per day"
+        )
+        rate_limit_enable_backoff: bool = Field(
+            True, description="Enable rate limit backoff"
+        )
+        rate_limit_max_retries: int = Field(
+            2, description="Retries after a 429 response when backoff is enabled"
+        )
 
-    # Optional: Database Configuration
-    database_url: Optional[str] = Field(
-        "sqlite:///instagram_mcp.db", description="Database URL"
-    )
-    database_echo: bool = Field(False, description="Database echo")
+        # Logging Configuration
+        log_level: str = Field("INFO", description="Log level")
+        log_format: str = Field("json", description="Log format")
+        log_file: Optional[str] = Field(
+            "logs/instagram_mcp.log", description="Log file path"
+        )
 
-    # Optional: Webhook Configuration
-    webhook_verify_token: Optional[str] = Field(
-        None, description="Webhook verify token"
-    )
-    webhook_secret: Optional[str] = Field(None, description="Webhook secret")
-    webhook_url: Optional[str] = Field(None, description="Webhook URL")
-
-    @field_validator("allowed_image_formats", "allowed_video_formats", mode="before")
-    @classmethod
-    def parse_list_from_string(cls, v):
-        """Parse comma-separated string into list."""
-        if isinstance(v, str):
-            return [item.strip() for item in v.split(",")]
-        return v
-
-    @field_validator("log_level")
-    @classmethod
-    def validate_log_level(cls, v):
-        """Validate log level."""
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if v.upper() not in valid_levels:
-            raise ValueError(f"Log level must be one of: {valid_levels}")
-        return v.upper()
-
-    @field_validator("log_format")
-    @classmethod
-    def validate_log_format(cls, v):
-        """Validate log format."""
-        valid_formats = ["json", "text"]
-        if v.lower() not in valid_formats:
-            raise ValueError(f"Log format must be one of: {valid_formats}")
-        return v.lower()
-
-    @field_validator("instagram_api_version")
-    @classmethod
-    def validate_api_version(cls, v):
-        """Validate Instagram API version format."""
-        if not v.startswith("v"):
-            raise ValueError("API version must start with 'v' (e.g., 'v19.0')")
-        return v
-
-    @property
-    def instagram_api_url(self) -> str:
-        """Get the full Instagram API URL."""
-        return f"{self.instagram_api_base_url}/{self.instagram_api_version}"
-
-    @property
-    def log_file_path(self) -> Optional[Path]:
-        """Get log file path as Path object."""
-        if self.log_file:
-            path = Path(self.log_file)
-            # Create directory if it doesn't exist
-            path.parent.mkdir(parents=True, exist_ok=True)
-            return path
-        return None
-
-    @property
-    def max_request_size_bytes(self) -> int:
-        """Get max request size in bytes."""
-        return self.max_request_size_mb * 1024 * 1024
-
-
-# Global settings instance - will be None until first access
-_settings: Optional[InstagramMCPSettings] = None
-
-
-def get_settings() -> InstagramMCPSettings:
+        # Cache Configuration
+        cache_enabled: bool = Field(True, description="Enable caching")
+        cache_ttl_seconds: int = Field(300, description="Cache TTL in seconds")
+        cache_max_entries: int = Field(1000, description="Max cached responses")
+        cache_error_ttl_seconds: int = Field(
+            30, description="Cache TTL for permanent API errors, 0 to disable"
+        )
+        redis_cache_enabled: bool = Field(
+            False, description="Share cached responses between workers via Redis"
+        )
+        redis_url: Optional[str] = Field(
+            "redis://localhost:6379/0", description="Redis URL"
+        )
+
+        # Security Configuration
+        enable_request_validation: bool = Field(
+            True, description="Enable request validation"
+        )
+        max_request_size_mb: int = Field(10, description="Max request size in MB")
+        allowed_image_formats: List[str] = Field(
+            ["jpg", "jpeg", "png", "gif"], description="Allowed image formats"
+        )
+        allowed_video_formats: List[str] = Field(
+            ["mp4", "mov"], description="Allowed video formats"
+        )
+
+        # Development Configuration
+        debug_mode: bool = Field(False, description="Debug mode")
+        mock_api_responses: bool = Field(False, description="Mock API responses")
+        enable_metrics: bool = Field(True, description="Enable metrics")
+
+        # MCP Server Configuration
+        mcp_server_name: str = Field(
+            "instagram-mcp-server", description="MCP server name"
+        )
+        mcp_server_version: str = Field("1.0.0", description="MCP server version")
+        mcp_transport: str = Field("stdio", description="MCP transport")
+
+        # Optional: Database Configuration
+        database_url: Optional[str] = Field(
+            "sqlite:///instagram_mcp.db", description="Database URL"
+        )
+        database_echo: bool = Field(False, description="Database echo")
+
+        # Optional: Webhook Configuration
+        webhook_verify_token: Optional[str] = Field(
+            None, description="Webhook verify token"
+        )
+        webhook_secret: Optional[str] = Field(None, description="Webhook secret")
+        webhook_url: Optional[str] = Field(None, description="Webhook URL")
+
+        # Derived values, computed once in model_post_init
+        _instagram_api_url: str = PrivateAttr()
+        _log_file_path: Optional[Path] = PrivateAttr(None)
+        _max_request_size_bytes: int = PrivateAttr()
+
+        @classmethod
+        def fast_load(cls) -> "InstagramMCPSettings":
+            """Load settings from the environment, skipping validation when safe.
+
+            When only plain string fields are overridden and no .env file is
+            present, the model is built with model_construct(). Otherwise this
+            falls back to the full pydantic-settings loader.
+            """
+            if os.path.exists(cls.model_config["env_file"]):
+                return cls()
+
+            overrides = {}
+            for key, value in os.environ.items():
+                name = key.lower()
+                if name in cls.model_fields:
+                    if name not in _FAST_LOAD_FIELDS:
+                        return cls()
+                    overrides[name] = value
+
+            if not all(name in overrides for name in _REQUIRED_FIELDS):
+                return cls()
+            return cls.model_construct(**overrides)
+
+        def model_post_init(self, __context: Any) -> None:
+            """Precompute derived settings so property reads are plain lookups."""
+            self._instagram_api_url = (
+                f"{self.instagram_api_base_url}/{self.instagram_api_version}"
+            )
+            self._max_request_size_bytes = self.max_request_size_mb << 20
+
+        @field_validator(
+            "allowed_image_formats", "allowed_video_formats", mode="before"
+        )
+        @classmethod
+        def parse_list_from_string(cls, v):
+            """Parse comma-separated string into list."""
+            if isinstance(v, str):
+                v = v.strip()
+                return _CSV_SPLIT(v) if v else []
+            return v
+
+        @field_validator("log_level")
+        @classmethod
+        def validate_log_level(cls, v):
+            """Validate log level."""
+            level = v.upper()
+            if level not in _VALID_LOG_LEVELS:
+                raise ValueError(
+                    f"Log level must be one of: {sorted(_VALID_LOG_LEVELS)}"
+                )
+            return sys.intern(level)
+
+        @field_validator("log_format")
+        @classmethod
+        def validate_log_format(cls, v):
+            """Validate log format."""
+            log_format = v.lower()
+            if log_format not in _VALID_LOG_FORMATS:
+                raise ValueError(
+                    f"Log format must be one of: {sorted(_VALID_LOG_FORMATS)}"
+                )
+            return sys.intern(log_format)
+
+        @field_validator("instagram_api_version")
+        @classmethod
+        def validate_api_version(cls, v):
+            """Validate Instagram API version format."""
+            if not v.startswith("v"):
+                raise ValueError("API version must start with 'v' (e.g., 'v19.0')")
+            return v
+
+        @property
+        def instagram_api_url(self) -> str:
+            """Get the full Instagram API URL."""
+            return self._instagram_api_url
+
+        @property
+        def log_file_path(self) -> Optional[Path]:
+            """Get log file path as Path object.
+
+            The log directory is created on first access, not when settings
+            load, so starting from a read-only directory still works.
+            frozen=True keeps log_file fixed, so the path is built once.
+            """
+            if self._log_file_path is None and self.log_file:
+                path = Path(self.log_file)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._log_file_path = path
+            return self._log_file_path
+
+        @property
+        def max_request_size_bytes(self) -> int:
+            """Get max request size in bytes."""
+            return self._max_request_size_bytes
+
+    return InstagramMCPSettings
+
+
+def __getattr__(name: str):
+    if name == "InstagramMCPSettings":
+        return _settings_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> "BaseSettings":
     """Get the global settings instance."""
-    global _settings
-    if _settings is None:
-        _settings = InstagramMCPSettings()
-    return _settings
+    return _settings_class().fast_load()
 
 
-def reload_settings() -> InstagramMCPSettings:
+def reload_settings() -> "BaseSettings":
     """Reload settings from environment variables."""
-    global _settings
-    _settings = InstagramMCPSettings()
-    return _settings
+    get_settings.cache_clear()
+    return get_settings()
@@ -2,16 +2,31 @@
 Instagram API client for MCP server.
 """
 
+import asyncio
+import hashlib
 import json
-from datetime import datetime, timedelta
-from io import BytesIO
-from typing import Any, Dict, List, Optional
+import logging
+import re
+import struct
+import time
+from functools import lru_cache, partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 from urllib.parse import urlencode
 
 import httpx
 import structlog
-from asyncio_throttle import Throttler
-from PIL import Image
+from cachetools import LRUCache, TLRUCache
+from pydantic import TypeAdapter
 
 from .config import get_settings
 from .models.instagram_models import (
@@ -31,7 +46,221 @@ from .models.instagram_models import (
     SendDMResponse,
 )
 
+
+def _stdlib_json_dumps(obj: Any) -> bytes:
+    """Serialize compact JSON bytes with the stdlib encoder."""
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+# orjson is optional; its decode errors subclass json.JSONDecodeError
+json_dumps: Callable[[Any], bytes]
+try:
+    from orjson import dumps as _orjson_dumps
+    from orjson import loads as json_loads
+
+    json_dumps = _orjson_dumps
+except ImportError:
+    json_loads = json.loads
+    json_dumps = _stdlib_json_dumps
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# redis is optional; it is only used for the shared cache tier
+_RedisError: Type[Exception]
+try:
+    from redis import asyncio as redis_asyncio
+    from redis.exceptions import RedisError as _RedisError
+except ImportError:
+    redis_asyncio = None
+    _RedisError = OSError
+
 logger = structlog.get_logger(__name__)
+# structlog builds the event dict before its level filter drops it, so debug
+# calls on the request path are guarded with the stdlib level check
+_stdlib_logger = logging.getLogger(__name__)
+
+
+def _debug_enabled() -> bool:
+    """Whether debug logs from this module would be emitted."""
+    return _stdlib_logger.isEnabledFor(logging.DEBUG)
+
+
+# Validate whole API result lists in one pass
+_PROFILE_ADAPTER = TypeAdapter(InstagramProfile)
+_MEDIA_LIST_ADAPTER = TypeAdapter(List[InstagramMedia])
+_MEDIA_INSIGHT_LIST_ADAPTER = TypeAdapter(List[MediaInsight])
+_ACCOUNT_INSIGHT_LIST_ADAPTER = TypeAdapter(List[AccountInsight])
+_PAGE_LIST_ADAPTER = TypeAdapter(List[FacebookPage])
+_CONVERSATION_LIST_ADAPTER = TypeAdapter(List[InstagramConversation])
+_MESSAGE_LIST_ADAPTER = TypeAdapter(List[InstagramMessage])
+
+# Response cache key: endpoint plus its params
+CacheKey = Tuple[str, FrozenSet[Tuple[str, Any]]]
+
+
+def _cache_entry_deadline(
+    key: CacheKey, entry: Tuple[Any, float, float, Optional[str]], now: float
+) -> float:
+    """Eviction time for a response cache entry: the end of its stale window."""
+    return entry[2]
+
+
+# Graph API field selections, joined once at import
+PROFILE_FIELDS = ",".join(
+    (
+        "id",
+        "username",
+        "name",
+        "biography",
+        "website",
+        "profile_picture_url",
+        "followers_count",
+        "follows_count",
+        "media_count",
+    )
+)
+MEDIA_FIELDS = ",".join(
+    (
+        "id",
+        "media_type",
+        "media_url",
+        "permalink",
+        "thumbnail_url",
+        "caption",
+        "timestamp",
+        "like_count",
+        "comments_count",
+    )
+)
+PAGE_FIELDS = "id,name,instagram_business_account"
+CONVERSATION_FIELDS = "id,updated_time,message_count"
+MESSAGE_FIELDS = "id,from,to,message,created_time,attachments"
+CONVERSATION_MESSAGES_FIELDS = f"messages{{{MESSAGE_FIELDS}}}"
+CONVERSATION_WITH_MESSAGES_FIELDS = (
+    f"{CONVERSATION_FIELDS},{CONVERSATION_MESSAGES_FIELDS}"
+)
+# Account insight metrics requested when the caller doesn't choose any
+DEFAULT_ACCOUNT_METRICS = "reach,profile_views,website_clicks"
+# Media insight metrics requested when the caller doesn't choose any
+DEFAULT_MEDIA_METRICS = (
+    InsightMetric.REACH,
+    InsightMetric.LIKES,
+    InsightMetric.COMMENTS,
+    InsightMetric.SHARES,
+    InsightMetric.SAVED,
+)
+
+
+@lru_cache(maxsize=32)
+def _join_metrics(metrics: Tuple[InsightMetric, ...]) -> str:
+    """Join insight metrics, sorted so their order doesn't change cache keys."""
+    return ",".join(sorted(m.value for m in metrics))
+
+
+DEFAULT_MEDIA_METRICS_PARAM = _join_metrics(DEFAULT_MEDIA_METRICS)
+
+
+def _metric_csv(metrics: Optional[List[InsightMetric]]) -> str:
+    """Get the comma-separated ``metric`` parameter the API expects."""
+    if not metrics:
+        return DEFAULT_MEDIA_METRICS_PARAM
+    return _join_metrics(tuple(metrics))
+
+
+# Error messages that indicate instagram_manage_messages lacks Advanced Access.
+# Sending is also refused with generic permission errors, so it matches more.
+_ADVANCED_ACCESS_ERROR_RE = re.compile(r"#2|unavailable|temporarily", re.IGNORECASE)
+_SEND_DM_ACCESS_ERROR_RE = re.compile(
+    r"#2|unavailable|temporarily|permissions|access", re.IGNORECASE
+)
+_ADVANCED_ACCESS_HINT = (
+    "\n\n⚠️  This error indicates that instagram_manage_messages permission "
+    "requires Advanced Access from Meta via App Review. "
+    "\n📖 See INSTAGRAM_DM_SETUP.md for the complete approval process."
+)
+
+
+def _augment_advanced_access_error(
+    error_msg: str, pattern: re.Pattern = _ADVANCED_ACCESS_ERROR_RE
+) -> str:
+    """Append Advanced Access guidance to DM errors that look like it's missing."""
+    if pattern.search(error_msg):
+        return error_msg + _ADVANCED_ACCESS_HINT
+    return error_msg
+
+
+# Image validation reads dimensions from the header at the start of the file
+IMAGE_HEADER_BYTES = 65536
+IMAGE_CHUNK_SIZE = 16384
+
+# Instagram accepted aspect ratios as (min, max, name), with ±2% tolerance
+ACCEPTED_ASPECT_RATIOS = (
+    (0.78, 0.82, "4:5 (portrait)"),
+    (0.98, 1.02, "1:1 (square)"),
+    (1.89, 1.93, "1.91:1 (landscape)"),
+)
+
+# JPEG start-of-frame markers, which carry the image dimensions
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def parse_image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from the header of a JPEG, PNG, GIF or WebP image.
+
+    Returns None if more data is needed. Raises ValueError for other formats.
+    """
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        if len(data) < 24:
+            return None
+        return struct.unpack(">II", data[16:24])
+
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        if len(data) < 10:
+            return None
+        return struct.unpack("<HH", data[6:10])
+
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        if len(data) < 30:
+            return None
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            width = int.from_bytes(data[24:27], "little") + 1
+            height = int.from_bytes(data[27:30], "little") + 1
+            return width, height
+        raise ValueError("Unsupported WebP image")
+
+    if data[:2] == b"\xff\xd8":
+        # Walk the marker segments until a start-of-frame segment
+        i = 2
+        while i + 4 <= len(data):
+            if data[i] != 0xFF:
+                raise ValueError("Corrupt JPEG image")
+            marker = data[i + 1]
+            if marker == 0xFF:
+                i += 1
+                continue
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                i += 2
+                continue
+            if marker in _JPEG_SOF_MARKERS:
+                if i + 9 > len(data):
+                    return None
+                height, width = struct.unpack(">HH", data[i + 5 : i + 9])
+                return width, height
+            i += 2 + struct.unpack(">H", data[i + 2 : i + 4])[0]
+        return None
+
+    if len(data) < 12:
+        return None
+    raise ValueError("Unsupported image format")
 
 
 class InstagramAPIError(Exception):
@@ -55,27 +284,161 @@ class RateLimitExceeded(InstagramAPIError):
     pass
 
 
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Allows bursts up to ``capacity`` requests and refills at ``capacity``
+    tokens per ``period`` seconds. Use as ``async with bucket:`` or call
+    ``acquire()`` directly, passing a cost for calls that count as several
+    requests.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate_per_sec = capacity / period
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, cost: int = 1) -> None:
+        """Wait until ``cost`` tokens are available and take them."""
+        # Never wait for more than a full bucket
+        cost = min(cost, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.last) * self.rate_per_sec
+                )
+                self.last = now
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return
+                await asyncio.sleep((cost - self.tokens) / self.rate_per_sec)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+
+class AccessTokenAuth(httpx.Auth):
+    """Add the access token as a query parameter to each outgoing request."""
+
+    def __init__(self, access_token: str):
+        self._params = {"access_token": access_token}
+
+    def auth_flow(self, request: httpx.Request):
+        request.url = request.url.copy_merge_params(self._params)
+        yield request
+
+
 class InstagramClient:
     """Instagram Graph API client with rate limiting and error handling."""
 
+    # Cache TTLs in seconds by endpoint pattern; anything unmatched uses
+    # the cache_ttl_seconds setting
+    CACHE_TTL_BY_ENDPOINT = (
+        (re.compile(r"^me/accounts$"), 86400),  # Connected pages
+        (re.compile(r"/insights$"), 900),  # Media and account insights
+        (re.compile(r"/media$"), 300),  # Media listings
+        (re.compile(r"^\d+$"), 3600),  # Profile lookups by account ID
+    )
+    # DM endpoints change quickly, so they are only cached briefly
+    DM_CACHE_TTL = 60
+    # How long past expiry an entry may still be served while it is refreshed
+    # in the background (stale-while-revalidate). Other endpoints get none.
+    CACHE_STALE_TTL_BY_ENDPOINT = (
+        (re.compile(r"/insights$"), 900),  # Media and account insights
+        (re.compile(r"^\d+$"), 3600),  # Profile lookups by account ID
+    )
+
+    # Process-wide HTTP client and the number of open instances using it
+    _shared_client: Optional[httpx.AsyncClient] = None
+    _shared_client_refs = 0
+
+    # Graph API error codes that won't succeed on retry (invalid parameter,
+    # permission denied, missing permission, unknown object). These and 404s
+    # are cached for cache_error_ttl_seconds so repeats don't spend the limit.
+    NON_TRANSIENT_ERROR_CODES = frozenset((10, 100, 200, 803))
+
+    # Upper bound on a single Retry-After wait after a 429, in seconds
+    MAX_RETRY_AFTER = 60.0
+
+    # Graph API limit on requests in one batch call
+    MAX_BATCH_SIZE = 50
+
+    # How long a successful token validation is trusted, in seconds
+    TOKEN_VALIDATION_TTL = 300.0
+
     def __init__(self):
         self.settings = get_settings()
         self.base_url = self.settings.instagram_api_url
         self.access_token = self.settings.instagram_access_token
+        # Applied per request so the shared HTTP client stays token-agnostic
+        self._auth = AccessTokenAuth(self.access_token)
+        # Settings are frozen, so the ones read on every request are hoisted
+        self._cache_enabled = self.settings.cache_enabled
+        self._cache_ttl = self.settings.cache_ttl_seconds
+        self._error_cache_ttl = self.settings.cache_error_ttl_seconds
+        self._max_retries = (
+            self.settings.rate_limit_max_retries
+            if self.settings.rate_limit_enable_backoff
+            else 0
+        )
+
+        # Latest app usage reported by the API in the X-App-Usage header
+        self._app_usage: Dict[str, int] = {}
 
         # Rate limiting
-        self.throttler = Throttler(
-            rate_limit=self.settings.rate_limit_requests_per_hour, period=3600  # 1 hour
+        self.throttler = TokenBucket(
+            self.settings.rate_limit_requests_per_hour, period=3600  # 1 hour
+        )
+
+        # HTTP client shared by all instances in the process
+        self.client = self._acquire_shared_client()
+        self._holds_shared_client = True
+
+        # LRU cache of (data, fresh deadline, stale deadline, ETag) entries,
+        # using monotonic time; entries past the stale deadline are dropped
+        self._cache: TLRUCache = TLRUCache(
+            maxsize=self.settings.cache_max_entries,
+            ttu=_cache_entry_deadline,
+            timer=time.monotonic,
         )
 
-        # HTTP client with timeout and retry configuration
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+        # Optional Redis tier shared by all workers, behind the local cache.
+        # Keys are namespaced by a hash of the token, never the token itself.
+        self._redis = None
+        if (
+            self._cache_enabled
+            and self.settings.redis_cache_enabled
+            and self.settings.redis_url
+        ):
+            if redis_asyncio is None:
+                logger.warning("Redis cache enabled but redis is not installed")
+            else:
+                self._redis = redis_asyncio.Redis.from_url(self.settings.redis_url)
+        token_hash = hashlib.sha256(self.access_token.encode()).hexdigest()[:16]
+        self._redis_prefix = f"ig-mcp:{token_hash}:"
+
+        # Monotonic deadline until which the token is known to be valid
+        self._token_valid_until = 0.0
+
+        # Validated results by (cache key, adapter), with the cached response
+        # they were validated from
+        self._validated_cache: LRUCache = LRUCache(
+            maxsize=self.settings.cache_max_entries
         )
 
-        # Cache for storing responses
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        # In-flight GET requests by cache key, for request coalescing
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+
+        # HTTP senders by upper-case method name
+        self._verb_dispatch = {"GET": self._http_get, "POST": self._http_post}
 
         logger.info(
             "Instagram client initialized",
@@ -90,39 +453,200 @@ class InstagramClient:
         """Async context manager exit."""
         await self.close()
 
+    @classmethod
+    def _acquire_shared_client(cls) -> httpx.AsyncClient:
+        """
+        Get the process-wide HTTP client, creating it if needed.
+
+        Sharing one client lets every instance reuse the same connection
+        pool. Creation is synchronous, so no lock is needed on the event loop.
+        """
+        client = cls._shared_client
+        if client is None or client.is_closed:
+            client = cls._shared_client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=20,
+                    max_connections=50,
+                    keepalive_expiry=30.0,
+                ),
+            )
+            cls._shared_client_refs = 0
+        cls._shared_client_refs += 1
+        return client
+
     async def close(self):
-        """Close the HTTP client."""
+        """Release the HTTP client, closing it once no instance uses it."""
+        if self._redis is not None:
+            redis, self._redis = self._redis, None
+            await redis.aclose()
+
+        cls = type(self)
+        if self.client is cls._shared_client:
+            if not self._holds_shared_client:
+                return
+            self._holds_shared_client = False
+            cls._shared_client_refs -= 1
+            if cls._shared_client_refs > 0:
+                return
+            cls._shared_client = None
+
         await self.client.aclose()
 
-    def _get_cache_key(self, endpoint: str, params: Dict[str, Any]) -> str:
+    def _http_get(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        data: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Send a GET request; GETs carry no body."""
+        return self.client.get(url, params=params, headers=headers, auth=self._auth)
+
+    def _http_post(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        data: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Send a POST request with an optional JSON body."""
+        if data:
+            return self.client.post(
+                url,
+                params=params,
+                content=json_dumps(data),
+                headers={**_JSON_HEADERS, **headers} if headers else _JSON_HEADERS,
+                auth=self._auth,
+            )
+        return self.client.post(url, params=params, headers=headers, auth=self._auth)
+
+    def _validated(
+        self,
+        adapter: TypeAdapter,
+        response: Dict[str, Any],
+        cache_key: CacheKey,
+        field: Optional[str] = "data",
+    ) -> Any:
+        """Validate response data, once per cached response.
+
+        Validates ``response[field]``, or the whole response if ``field`` is
+        None. Cache hits return the same decoded object, so the validated
+        result is reused while ``response`` is the one cached under
+        ``cache_key``; other responses are validated every time. Lists are
+        copied so callers can modify them; the models inside are shared and
+        must not be mutated.
+        """
+        data = response if field is None else response.get(field, [])
+        entry = self._cache.get(cache_key) if self._cache_enabled else None
+        if entry is None or entry[0] is not response:
+            return adapter.validate_python(data)
+        key = (cache_key, adapter)
+        memo = self._validated_cache.get(key)
+        if memo is None or memo[0] is not response:
+            memo = (response, adapter.validate_python(data))
+            self._validated_cache[key] = memo
+        result = memo[1]
+        return list(result) if isinstance(result, list) else result
+
+    def _get_cache_key(self, endpoint: str, params: Dict[str, Any]) -> CacheKey:
         """Generate cache key for request."""
-        param_str = urlencode(sorted(params.items()))
-        return f"{endpoint}?{param_str}"
+        return endpoint, frozenset(params.items())
 
-    def _is_cache_valid(self, cache_entry: Dict[str, Any]) -> bool:
-        """Check if cache entry is still valid."""
-        if not self.settings.cache_enabled:
-            return False
+    def _redis_key(self, cache_key: CacheKey) -> str:
+        """Build a stable, fixed-size Redis key for a local cache key."""
+        endpoint, params = cache_key
+        query = "&".join(f"{name}={value}" for name, value in sorted(params))
+        digest = hashlib.blake2b(f"{endpoint}?{query}".encode(), digest_size=16)
+        return self._redis_prefix + digest.hexdigest()
 
-        expires_at = cache_entry.get("expires_at")
-        if not expires_at:
-            return False
+    async def _redis_get(self, cache_key: CacheKey) -> Optional[Tuple[Any, int]]:
+        """Fetch a shared cached response and its remaining TTL in seconds."""
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                key = self._redis_key(cache_key)
+                raw, ttl = await pipe.get(key).ttl(key).execute()
+        except (_RedisError, OSError) as e:
+            logger.warning("Redis cache read failed", error=str(e))
+            return None
+        if raw is None or ttl <= 0:
+            return None
+        return json_loads(raw), ttl
+
+    async def _redis_set(self, cache_key: CacheKey, data: Any, ttl: int) -> None:
+        """Share a cached response with other workers."""
+        try:
+            await self._redis.set(self._redis_key(cache_key), json_dumps(data), ex=ttl)
+        except (_RedisError, OSError) as e:
+            logger.warning("Redis cache write failed", error=str(e))
+
+    def _ttl_for(self, endpoint: str, use_facebook_api: bool = False) -> int:
+        """Get the cache TTL for an endpoint."""
+        if use_facebook_api:
+            return self.DM_CACHE_TTL
+
+        for pattern, ttl in self.CACHE_TTL_BY_ENDPOINT:
+            if pattern.search(endpoint):
+                return ttl
 
-        return datetime.fromisoformat(expires_at) > datetime.utcnow()
+        return self._cache_ttl
 
-    def _cache_response(self, key: str, data: Any) -> None:
-        """Cache API response."""
-        if not self.settings.cache_enabled:
+    def _stale_ttl_for(self, endpoint: str, use_facebook_api: bool = False) -> int:
+        """Get how long an expired entry may be served while it is refreshed."""
+        if use_facebook_api:
+            return 0
+
+        for pattern, ttl in self.CACHE_STALE_TTL_BY_ENDPOINT:
+            if pattern.search(endpoint):
+                return ttl
+
+        return 0
+
+    def _cache_response(
+        self,
+        key: CacheKey,
+        data: Any,
+        ttl: Optional[int] = None,
+        stale_ttl: int = 0,
+        etag: Optional[str] = None,
+    ) -> None:
+        """Cache API response, with its ETag for later revalidation."""
+        if not self._cache_enabled:
             return
 
-        expires_at = datetime.utcnow() + timedelta(
-            seconds=self.settings.cache_ttl_seconds
-        )
-        self._cache[key] = {
-            "data": data,
-            "expires_at": expires_at.isoformat(),
-            "cached_at": datetime.utcnow().isoformat(),
-        }
+        if ttl is None:
+            ttl = self._cache_ttl
+        if ttl <= 0:
+            return
+
+        expires = time.monotonic() + ttl
+        self._cache[key] = (data, expires, expires + stale_ttl, etag)
+
+    async def _read_image_size(
+        self, image_url: str, ranged: bool = True
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Stream an image until its dimensions can be read from the header.
+
+        The transfer is abandoned as soon as the header parses. Returns None
+        if a ranged download ended before the dimensions could be read.
+        """
+        headers = {"Range": f"bytes=0-{IMAGE_HEADER_BYTES - 1}"} if ranged else None
+        buffer = bytearray()
+
+        async with self.client.stream("GET", image_url, headers=headers) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(IMAGE_CHUNK_SIZE):
+                buffer += chunk
+                size = parse_image_size(buffer)
+                if size:
+                    return size
+
+            if response.status_code == 206:
+                return None
+
+        raise ValueError("Image ended before its dimensions could be read")
 
     async def _validate_image_aspect_ratio(self, image_url: str) -> None:
         """
@@ -135,24 +659,16 @@ class InstagramClient:
         - Landscape: 1.91:1 (ratio 1.91)
         """
         try:
-            # Download image to get dimensions
-            response = await self.client.get(image_url)
-            response.raise_for_status()
-
-            # Open image and get dimensions
-            image = Image.open(BytesIO(response.content))
-            width, height = image.size
+            # Dimensions live in the image header, so only fetch the start
+            size = await self._read_image_size(image_url)
+            if size is None:
+                # Header didn't fit in the partial download; fetch the whole image
+                size = await self._read_image_size(image_url, ranged=False)
+            width, height = size
             ratio = width / height
 
-            # Instagram accepted ratios with tolerance
-            ACCEPTED_RATIOS = {
-                "4:5 (portrait)": (0.8, 0.78, 0.82),      # 4:5 with ±2% tolerance
-                "1:1 (square)": (1.0, 0.98, 1.02),        # 1:1 with ±2% tolerance
-                "1.91:1 (landscape)": (1.91, 1.89, 1.93), # 1.91:1 with ±2% tolerance
-            }
-
             # Check if ratio matches any accepted ratio
-            for ratio_name, (target, min_ratio, max_ratio) in ACCEPTED_RATIOS.items():
+            for min_ratio, max_ratio, ratio_name in ACCEPTED_ASPECT_RATIOS:
                 if min_ratio <= ratio <= max_ratio:
                     logger.debug(
                         "Image aspect ratio valid",
@@ -201,6 +717,7 @@ class InstagramClient:
         data: Optional[Dict[str, Any]] = None,
         use_cache: bool = True,
         use_facebook_api: bool = False,
+        cost: int = 1,
     ) -> Dict[str, Any]:
         """
         Make HTTP request to Instagram API with rate limiting and error handling.
@@ -208,34 +725,143 @@ class InstagramClient:
         Args:
             use_facebook_api: If True, use graph.facebook.com instead of graph.instagram.com.
                              Required for Instagram Direct Messaging (Messenger Platform API).
+            cost: Rate limit tokens the request uses, e.g. one per batch entry.
         """
 
-        # Prepare request parameters
+        method = method.upper()
+
+        # Prepare request parameters; the access token is added by self._auth
         if params is None:
             params = {}
 
-        # Add access token to params
-        params["access_token"] = self.access_token
-
-        # Check cache first for GET requests
-        cache_key = self._get_cache_key(endpoint, params)
-        if method.upper() == "GET" and use_cache and cache_key in self._cache:
-            cache_entry = self._cache[cache_key]
-            if self._is_cache_valid(cache_entry):
-                logger.debug("Cache hit", endpoint=endpoint)
-                return cache_entry["data"]
-
-        # Apply rate limiting
-        async with self.throttler:
-            # Choose base URL: Facebook for DMs, Instagram for everything else
-            if use_facebook_api:
-                base_url = "https://graph.facebook.com/v22.0"
-            else:
-                base_url = self.base_url
+        if method == "GET" and use_cache:
+            # Check cache first; the key is built inline, as _get_cache_key
+            # does, to keep a call off every request
+            cache_key = (endpoint, frozenset(params.items()))
+            cache_entry = self._cache.get(cache_key) if self._cache_enabled else None
+            if cache_entry is not None:
+                cached, fresh_until, _, etag = cache_entry
+                if isinstance(cached, InstagramAPIError):
+                    raise InstagramAPIError(
+                        cached.message, cached.error_code, cached.error_subcode
+                    )
+                if time.monotonic() < fresh_until:
+                    if _debug_enabled():
+                        logger.debug("Cache hit", endpoint=endpoint)
+                else:
+                    # Serve the stale copy and refresh it in the background,
+                    # conditionally if the API gave us an ETag
+                    if _debug_enabled():
+                        logger.debug("Serving stale cache entry", endpoint=endpoint)
+                    self._start_get(
+                        endpoint,
+                        params,
+                        use_facebook_api,
+                        cache_key,
+                        revalidate=(cached, etag) if etag else None,
+                    )
+                return cached
+
+            # Identical concurrent GETs share one in-flight request
+            task = self._start_get(endpoint, params, use_facebook_api, cache_key)
+            # Shield so one caller being cancelled doesn't cancel the others
+            return await asyncio.shield(task)
+
+        return await self._send_request(
+            method,
+            endpoint,
+            params=params,
+            data=data,
+            use_facebook_api=use_facebook_api,
+            cost=cost,
+        )
+
+    def _start_get(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        use_facebook_api: bool,
+        cache_key: CacheKey,
+        revalidate: Optional[Tuple[Any, str]] = None,
+    ) -> asyncio.Future:
+        """Start a cached GET, or return the matching request already in flight."""
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            if _debug_enabled():
+                logger.debug("Joining in-flight request", endpoint=endpoint)
+            return task
+
+        task = asyncio.ensure_future(
+            self._send_request(
+                "GET",
+                endpoint,
+                params=params,
+                data=None,
+                use_facebook_api=use_facebook_api,
+                cache_key=cache_key,
+                revalidate=revalidate,
+            )
+        )
+        self._inflight[cache_key] = task
+        task.add_done_callback(partial(self._request_done, cache_key))
+        return task
 
-            url = f"{base_url}/{endpoint}"
+    def _request_done(self, cache_key: CacheKey, task: asyncio.Future) -> None:
+        """Forget a finished in-flight GET.
 
-            try:
+        The exception is retrieved here because background refreshes have no
+        awaiting caller; the error was already logged by _send_request.
+        """
+        self._inflight.pop(cache_key, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Dict[str, Any],
+        data: Optional[Dict[str, Any]],
+        use_facebook_api: bool,
+        cache_key: Optional[CacheKey] = None,
+        revalidate: Optional[Tuple[Any, str]] = None,
+        cost: int = 1,
+    ) -> Dict[str, Any]:
+        """
+        Send a request to the API and cache successful GET responses.
+
+        Args:
+            cache_key: Key to cache a GET response under; None skips caching.
+            revalidate: Stale (data, ETag) to refresh with a conditional GET.
+                        A 304 reply reuses the data without decoding a body.
+            cost: Rate limit tokens to take for each attempt.
+        """
+        if cache_key is not None and self._redis is not None:
+            shared = await self._redis_get(cache_key)
+            if shared is not None:
+                if _debug_enabled():
+                    logger.debug("Shared cache hit", endpoint=endpoint)
+                shared_data, ttl = shared
+                self._cache_response(
+                    cache_key,
+                    shared_data,
+                    ttl,
+                    self._stale_ttl_for(endpoint, use_facebook_api),
+                )
+                return shared_data
+
+        # Choose base URL: Facebook for DMs, Instagram for everything else
+        if use_facebook_api:
+            base_url = "https://graph.facebook.com/v22.0"
+        else:
+            base_url = self.base_url
+
+        url = f"{base_url}/{endpoint}"
+
+        debug = _debug_enabled()
+        try:
+            if debug:
                 logger.debug(
                     "Making API request",
                     method=method,
@@ -243,53 +869,115 @@ class InstagramClient:
                     params=params,
                 )
 
-                if method.upper() == "GET":
-                    response = await self.client.get(url, params=params)
-                elif method.upper() == "POST":
-                    if data:
-                        response = await self.client.post(url, params=params, json=data)
-                    else:
-                        response = await self.client.post(url, params=params)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-
-                # Check for rate limiting
-                if response.status_code == 429:
-                    logger.warning("Rate limit exceeded", endpoint=endpoint)
-                    raise RateLimitExceeded("Instagram API rate limit exceeded")
-
-                # Parse response
-                response_data = response.json()
-
-                # Check for API errors
-                if "error" in response_data:
-                    error = response_data["error"]
-                    error_msg = error.get("message", "Unknown error")
-                    error_code = error.get("code")
-                    error_subcode = error.get("error_subcode")
-
-                    logger.error(
-                        "Instagram API error",
-                        error_message=error_msg,
-                        error_code=error_code,
-                        error_subcode=error_subcode,
-                    )
+            send = self._verb_dispatch.get(method)
+            if send is None:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+            # Only the network call spends rate limit; cache hits never get
+            # here and decoding happens after the token is taken
+            headers = {"If-None-Match": revalidate[1]} if revalidate else None
+            for attempt in range(self._max_retries + 1):
+                await self.throttler.acquire(cost)
+                response = await send(url, params, data, headers)
+                self._record_app_usage(response)
+                if response.status_code != 429 or attempt == self._max_retries:
+                    break
+                retry_after = self._retry_after(response)
+                logger.warning(
+                    "Rate limited, retrying",
+                    endpoint=endpoint,
+                    retry_after=retry_after,
+                )
+                await asyncio.sleep(retry_after)
 
-                    raise InstagramAPIError(error_msg, error_code, error_subcode)
+            # Check for rate limiting
+            if response.status_code == 429:
+                logger.warning("Rate limit exceeded", endpoint=endpoint)
+                raise RateLimitExceeded("Instagram API rate limit exceeded")
 
-                # Cache successful GET responses
-                if method.upper() == "GET" and use_cache:
-                    self._cache_response(cache_key, response_data)
+            # Unchanged since the cached copy; extend it without decoding
+            if (
+                response.status_code == 304
+                and revalidate is not None
+                and cache_key is not None
+            ):
+                if debug:
+                    logger.debug("Cached response not modified", endpoint=endpoint)
+                stale_data, etag = revalidate
+                self._cache_response(
+                    cache_key,
+                    stale_data,
+                    self._ttl_for(endpoint, use_facebook_api),
+                    self._stale_ttl_for(endpoint, use_facebook_api),
+                    etag,
+                )
+                return stale_data
+
+            # Parse response
+            response_data = json_loads(response.content)
+
+            # Check for API errors
+            if "error" in response_data:
+                error = response_data["error"]
+                error_msg = error.get("message", "Unknown error")
+                error_code = error.get("code")
+                error_subcode = error.get("error_subcode")
+
+                logger.error(
+                    "Instagram API error",
+                    error_message=error_msg,
+                    error_code=error_code,
+                    error_subcode=error_subcode,
+                )
+
+                api_error = InstagramAPIError(error_msg, error_code, error_subcode)
+                if cache_key is not None and (
+                    error_code in self.NON_TRANSIENT_ERROR_CODES
+                    or response.status_code == 404
+                ):
+                    self._cache_response(cache_key, api_error, self._error_cache_ttl)
+                raise api_error
+
+            # Cache successful GET responses
+            if cache_key is not None:
+                ttl = self._ttl_for(endpoint, use_facebook_api)
+                self._cache_response(
+                    cache_key,
+                    response_data,
+                    ttl,
+                    self._stale_ttl_for(endpoint, use_facebook_api),
+                    response.headers.get("etag"),
+                )
+                if self._redis is not None and ttl > 0:
+                    await self._redis_set(cache_key, response_data, ttl)
 
+            if debug:
                 logger.debug("API request successful", endpoint=endpoint)
-                return response_data
+            return response_data
 
-            except httpx.RequestError as e:
-                logger.error("HTTP request failed", error=str(e), endpoint=endpoint)
-                raise InstagramAPIError(f"HTTP request failed: {str(e)}")
-            except json.JSONDecodeError as e:
-                logger.error("Failed to parse JSON response", error=str(e))
-                raise InstagramAPIError(f"Invalid JSON response: {str(e)}")
+        except httpx.RequestError as e:
+            logger.error("HTTP request failed", error=str(e), endpoint=endpoint)
+            raise InstagramAPIError(f"HTTP request failed: {str(e)}")
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse JSON response", error=str(e))
+            raise InstagramAPIError(f"Invalid JSON response: {str(e)}")
+
+    def _retry_after(self, response: httpx.Response) -> float:
+        """Seconds to wait before retrying a 429, from its Retry-After header."""
+        try:
+            retry_after = float(response.headers.get("retry-after", 1))
+        except ValueError:
+            retry_after = 1.0
+        return min(max(retry_after, 0.0), self.MAX_RETRY_AFTER)
+
+    def _record_app_usage(self, response: httpx.Response) -> None:
+        """Remember the app usage percentages the API reports with a response."""
+        usage = response.headers.get("x-app-usage")
+        if not usage:
+            return
+        try:
+            self._app_usage = json_loads(usage)
+        except ValueError:
+            logger.warning("Invalid X-App-Usage header", value=usage)
 
     async def get_profile_info(
         self, account_id: Optional[str] = None
@@ -301,23 +989,16 @@ class InstagramClient:
         if not account_id:
             raise InstagramAPIError("Instagram business account ID not configured")
 
-        fields = [
-            "id",
-            "username",
-            "name",
-            "biography",
-            "website",
-            "profile_picture_url",
-            "followers_count",
-            "follows_count",
-            "media_count",
-        ]
-
-        params = {"fields": ",".join(fields)}
+        params = {"fields": PROFILE_FIELDS}
 
         try:
             data = await self._make_request("GET", account_id, params=params)
-            return InstagramProfile(**data)
+            return self._validated(
+                _PROFILE_ADAPTER,
+                data,
+                self._get_cache_key(account_id, params),
+                field=None,
+            )
         except Exception as e:
             logger.error("Failed to get profile info", error=str(e))
             raise InstagramAPIError(f"Failed to get profile info: {str(e)}")
@@ -327,28 +1008,28 @@ class InstagramClient:
         account_id: Optional[str] = None,
         limit: int = 25,
         after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
     ) -> List[InstagramMedia]:
-        """Get recent media posts from Instagram account."""
+        """
+        Get recent media posts from Instagram account.
+
+        Args:
+            fields: Optional subset of media fields to request. ``id`` and
+                    ``media_type`` are always included.
+        """
         if not account_id:
             account_id = self.settings.instagram_business_account_id
 
         if not account_id:
             raise InstagramAPIError("Instagram business account ID not configured")
 
-        fields = [
-            "id",
-            "media_type",
-            "media_url",
-            "permalink",
-            "thumbnail_url",
-            "caption",
-            "timestamp",
-            "like_count",
-            "comments_count",
-        ]
+        if fields:
+            fields_param = ",".join(dict.fromkeys(["id", "media_type", *fields]))
+        else:
+            fields_param = MEDIA_FIELDS
 
         params = {
-            "fields": ",".join(fields),
+            "fields": fields_param,
             "limit": min(limit, 100),  # Instagram API limit
         }
 
@@ -356,49 +1037,68 @@ class InstagramClient:
             params["after"] = after
 
         try:
-            data = await self._make_request("GET", f"{account_id}/media", params=params)
-            media_list = []
-
-            for item in data.get("data", []):
-                # Convert timestamp to datetime
-                if "timestamp" in item:
-                    item["timestamp"] = datetime.fromisoformat(
-                        item["timestamp"].replace("Z", "+00:00")
-                    )
-
-                media_list.append(InstagramMedia(**item))
-
-            return media_list
+            endpoint = f"{account_id}/media"
+            data = await self._make_request("GET", endpoint, params=params)
+            return self._validated(
+                _MEDIA_LIST_ADAPTER, data, self._get_cache_key(endpoint, params)
+            )
 
         except Exception as e:
             logger.error("Failed to get media posts", error=str(e))
             raise InstagramAPIError(f"Failed to get media posts: {str(e)}")
 
+    async def get_media_posts_with_insights(
+        self,
+        account_id: Optional[str] = None,
+        limit: int = 25,
+        metrics: Optional[List[InsightMetric]] = None,
+    ) -> List[InstagramMedia]:
+        """
+        Get recent media posts together with their insights in one request.
+
+        Insights are expanded as a nested field on the media edge, so this
+        replaces one get_media_posts call plus a get_media_insights call per
+        post. Each post's ``insights`` holds the requested metrics.
+        """
+        if not account_id:
+            account_id = self.settings.instagram_business_account_id
+
+        if not account_id:
+            raise InstagramAPIError("Instagram business account ID not configured")
+
+        metric_csv = _metric_csv(metrics)
+        params = {
+            "fields": f"{MEDIA_FIELDS},insights.metric({metric_csv})",
+            "limit": min(limit, 100),  # Instagram API limit
+        }
+
+        try:
+            endpoint = f"{account_id}/media"
+            data = await self._make_request("GET", endpoint, params=params)
+            return self._validated(
+                _MEDIA_LIST_ADAPTER, data, self._get_cache_key(endpoint, params)
+            )
+
+        except Exception as e:
+            logger.error("Failed to get media posts with insights", error=str(e))
+            raise InstagramAPIError(
+                f"Failed to get media posts with insights: {str(e)}"
+            )
+
     async def get_media_insights(
         self, media_id: str, metrics: Optional[List[InsightMetric]] = None
     ) -> List[MediaInsight]:
         """Get insights for a specific media post."""
-        if not metrics:
-            metrics = [
-                InsightMetric.REACH,
-                InsightMetric.LIKES,
-                InsightMetric.COMMENTS,
-                InsightMetric.SHARES,
-                InsightMetric.SAVED,
-            ]
-
-        params = {"metric": ",".join([m.value for m in metrics])}
+        params = {"metric": _metric_csv(metrics)}
 
         try:
-            data = await self._make_request(
-                "GET", f"{media_id}/insights", params=params
+            endpoint = f"{media_id}/insights"
+            data = await self._make_request("GET", endpoint, params=params)
+            return self._validated(
+                _MEDIA_INSIGHT_LIST_ADAPTER,
+                data,
+                self._get_cache_key(endpoint, params),
             )
-            insights = []
-
-            for item in data.get("data", []):
-                insights.append(MediaInsight(**item))
-
-            return insights
 
         except Exception as e:
             logger.error(
@@ -406,33 +1106,166 @@ class InstagramClient:
             )
             raise InstagramAPIError(f"Failed to get media insights: {str(e)}")
 
+    async def get_media_insights_bulk(
+        self,
+        media_ids: List[str],
+        metrics: Optional[List[InsightMetric]] = None,
+        concurrency: int = 8,
+    ) -> List[Union[List[MediaInsight], InstagramAPIError]]:
+        """Get insights for several media posts.
+
+        Posts with a cached response go through get_media_insights; the rest
+        are fetched with Graph API batch requests of up to MAX_BATCH_SIZE
+        posts, at most ``concurrency`` batches in flight at once. Results are
+        returned in the order of ``media_ids``; a failed lookup yields its
+        exception in place instead of aborting the whole batch.
+        """
+        params = {"metric": _metric_csv(metrics)}
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_cached(media_id: str) -> List[MediaInsight]:
+            async with semaphore:
+                return await self.get_media_insights(media_id, metrics)
+
+        async def fetch_batch(batch: List[str]) -> List[Any]:
+            async with semaphore:
+                return await self._get_insights_batch(batch, params)
+
+        cached = {}
+        uncached = []
+        for media_id in dict.fromkeys(media_ids):
+            key = self._get_cache_key(f"{media_id}/insights", params)
+            if self._cache_enabled and key in self._cache:
+                cached[media_id] = fetch_cached(media_id)
+            else:
+                uncached.append(media_id)
+
+        batches = [
+            uncached[i : i + self.MAX_BATCH_SIZE]
+            for i in range(0, len(uncached), self.MAX_BATCH_SIZE)
+        ]
+        cached_results, batch_results = await asyncio.gather(
+            asyncio.gather(*cached.values(), return_exceptions=True),
+            asyncio.gather(*map(fetch_batch, batches), return_exceptions=True),
+        )
+
+        by_id = dict(zip(cached, cached_results))
+        for batch, result in zip(batches, batch_results):
+            if isinstance(result, BaseException):
+                result = [result] * len(batch)
+            by_id.update(zip(batch, result))
+        return [by_id[media_id] for media_id in media_ids]
+
+    async def _get_insights_batch(
+        self, media_ids: List[str], params: Dict[str, Any]
+    ) -> List[Union[List[MediaInsight], InstagramAPIError]]:
+        """Fetch insights for up to MAX_BATCH_SIZE posts in one batch call.
+
+        Each successful result is cached under its single-post request key,
+        so later get_media_insights calls are cache hits.
+        """
+        query = urlencode(params)
+        batch = [
+            {"method": "GET", "relative_url": f"{media_id}/insights?{query}"}
+            for media_id in media_ids
+        ]
+        # A batch call replies with a list, one entry per request; the API
+        # counts every entry against the rate limit
+        responses: Any = await self._make_request(
+            "POST",
+            "",
+            data={"batch": batch, "include_headers": False},
+            cost=len(batch),
+        )
+
+        if not isinstance(responses, list):
+            logger.error("Unexpected batch response", response=responses)
+            responses = []
+
+        results: List[Union[List[MediaInsight], InstagramAPIError]] = []
+        for index, media_id in enumerate(media_ids):
+            try:
+                if index >= len(responses):
+                    raise InstagramAPIError("No response for request in batch")
+                item = responses[index]
+                results.append(self._insights_batch_item(media_id, params, item))
+            except InstagramAPIError as e:
+                logger.error(
+                    "Failed to get media insights", error=str(e), media_id=media_id
+                )
+                results.append(e)
+        return results
+
+    def _insights_batch_item(
+        self, media_id: str, params: Dict[str, Any], item: Optional[Dict[str, Any]]
+    ) -> List[MediaInsight]:
+        """Decode, cache and validate one response from an insights batch."""
+        # The API returns null for requests it did not get to in time
+        if item is None:
+            raise InstagramAPIError("Batch request timed out")
+
+        try:
+            body = json_loads(item.get("body") or "{}")
+        except json.JSONDecodeError as e:
+            raise InstagramAPIError(f"Invalid JSON response: {str(e)}")
+
+        if "error" in body:
+            error = body["error"]
+            raise InstagramAPIError(
+                error.get("message", "Unknown error"),
+                error.get("code"),
+                error.get("error_subcode"),
+            )
+
+        status = item.get("code") or 200
+        if status >= 400:
+            raise InstagramAPIError(f"Batch request failed with HTTP {status}")
+
+        endpoint = f"{media_id}/insights"
+        key = self._get_cache_key(endpoint, params)
+        if self._cache_enabled:
+            self._cache_response(
+                key,
+                body,
+                self._ttl_for(endpoint),
+                self._stale_ttl_for(endpoint),
+            )
+        return self._validated(_MEDIA_INSIGHT_LIST_ADAPTER, body, key)
+
     async def publish_media(self, request: PublishMediaRequest) -> PublishMediaResponse:
         """Publish media to Instagram account."""
         account_id = self.settings.instagram_business_account_id
         if not account_id:
             raise InstagramAPIError("Instagram business account ID not configured")
 
-        try:
-            # Validate image aspect ratio before API call
-            if request.image_url:
-                await self._validate_image_aspect_ratio(str(request.image_url))
-            # Note: Video validation would require different logic (not implemented yet)
+        # Validate image aspect ratio in the background while the container
+        # request is prepared; it must pass before the API call
+        validation = None
+        if request.image_url:
+            validation = asyncio.create_task(
+                self._validate_image_aspect_ratio(request.image_url)
+            )
+        # Note: Video validation would require different logic (not implemented yet)
 
+        try:
             # Step 1: Create media container
             container_data = {
                 "caption": request.caption or "",
             }
 
             if request.image_url:
-                container_data["image_url"] = str(request.image_url)
+                container_data["image_url"] = request.image_url
             elif request.video_url:
-                container_data["video_url"] = str(request.video_url)
+                container_data["video_url"] = request.video_url
             else:
                 raise InstagramAPIError("Either image_url or video_url is required")
 
             if request.location_id:
                 container_data["location_id"] = request.location_id
 
+            if validation is not None:
+                await validation
+
             container_response = await self._make_request(
                 "POST", f"{account_id}/media", data=container_data
             )
@@ -450,19 +1283,19 @@ class InstagramClient:
         except Exception as e:
             logger.error("Failed to publish media", error=str(e))
             raise InstagramAPIError(f"Failed to publish media: {str(e)}")
+        finally:
+            if validation is not None and not validation.done():
+                validation.cancel()
 
     async def get_account_pages(self) -> List[FacebookPage]:
         """Get Facebook pages connected to the account."""
-        params = {"fields": "id,name,instagram_business_account"}
+        params = {"fields": PAGE_FIELDS}
 
         try:
             data = await self._make_request("GET", "me/accounts", params=params)
-            pages = []
-
-            for item in data.get("data", []):
-                pages.append(FacebookPage(**item))
-
-            return pages
+            return self._validated(
+                _PAGE_LIST_ADAPTER, data, self._get_cache_key("me/accounts", params)
+            )
 
         except Exception as e:
             logger.error("Failed to get account pages", error=str(e))
@@ -481,36 +1314,39 @@ class InstagramClient:
         if not account_id:
             raise InstagramAPIError("Instagram business account ID not configured")
 
-        if not metrics:
-            metrics = ["reach", "profile_views", "website_clicks"]
-
         params = {
-            "metric": ",".join(metrics),
+            "metric": ",".join(metrics) if metrics else DEFAULT_ACCOUNT_METRICS,
             "period": period.value,
             "metric_type": "total_value"  # Required for action metrics like website_clicks
         }
 
         try:
-            data = await self._make_request(
-                "GET", f"{account_id}/insights", params=params
+            endpoint = f"{account_id}/insights"
+            data = await self._make_request("GET", endpoint, params=params)
+            return self._validated(
+                _ACCOUNT_INSIGHT_LIST_ADAPTER,
+                data,
+                self._get_cache_key(endpoint, params),
             )
-            insights = []
-
-            for item in data.get("data", []):
-                insights.append(AccountInsight(**item))
-
-            return insights
 
         except Exception as e:
             logger.error("Failed to get account insights", error=str(e))
             raise InstagramAPIError(f"Failed to get account insights: {str(e)}")
 
     async def validate_access_token(self) -> bool:
-        """Validate the access token."""
+        """Validate the access token.
+
+        A successful validation is remembered for TOKEN_VALIDATION_TTL
+        seconds; failures are always rechecked.
+        """
+        if time.monotonic() < self._token_valid_until:
+            return True
+
         try:
             await self._make_request(
                 "GET", "me", params={"fields": "id"}, use_cache=False
             )
+            self._token_valid_until = time.monotonic() + self.TOKEN_VALIDATION_TTL
             return True
         except InstagramAPIError:
             return False
@@ -518,11 +1354,16 @@ class InstagramClient:
     async def get_conversations(
         self,
         page_id: Optional[str] = None,
-        limit: int = 25
+        limit: int = 25,
+        include_messages: bool = False,
     ) -> List[InstagramConversation]:
         """
         Get Instagram DM conversations for a Facebook page.
 
+        Args:
+            include_messages: Expand each conversation's messages in the same
+                              request instead of one request per conversation.
+
         Note: Requires instagram_manage_messages permission.
         """
         if not page_id:
@@ -533,10 +1374,13 @@ class InstagramClient:
             page_id = pages[0].id
             logger.info(f"Using page ID: {page_id}")
 
-        fields = "id,updated_time,message_count"
         params = {
             "platform": "instagram",
-            "fields": fields,
+            "fields": (
+                CONVERSATION_WITH_MESSAGES_FIELDS
+                if include_messages
+                else CONVERSATION_FIELDS
+            ),
             "limit": min(limit, 100)
         }
 
@@ -547,25 +1391,25 @@ class InstagramClient:
                 params=params,
                 use_facebook_api=True  # DMs use graph.facebook.com
             )
-            conversations = []
-
-            for item in data.get("data", []):
-                conversations.append(InstagramConversation(**item))
+            items = data.get("data", [])
+            if include_messages:
+                # Expanded messages arrive as a paged edge: {"data": [...]}.
+                # The response may be cached, so unwrap into new dicts.
+                items = [
+                    {**item, "messages": item["messages"].get("data", [])}
+                    if isinstance(item.get("messages"), dict)
+                    else item
+                    for item in items
+                ]
+
+            conversations = _CONVERSATION_LIST_ADAPTER.validate_python(items)
 
             logger.info(f"Retrieved {len(conversations)} conversations")
             return conversations
 
         except InstagramAPIError as e:
             logger.error("Failed to get conversations", error=str(e))
-            error_msg = str(e)
-            # Detect Advanced Access permission error
-            if "#2" in error_msg or "unavailable" in error_msg.lower() or "temporarily" in error_msg.lower():
-                error_msg += (
-                    "\n\n⚠️  This error indicates that instagram_manage_messages permission "
-                    "requires Advanced Access from Meta via App Review. "
-                    "\n📖 See INSTAGRAM_DM_SETUP.md for the complete approval process."
-                )
-            raise InstagramAPIError(error_msg)
+            raise InstagramAPIError(_augment_advanced_access_error(str(e)))
         except Exception as e:
             logger.error("Failed to get conversations", error=str(e))
             raise InstagramAPIError(f"Failed to get conversations: {str(e)}")
@@ -580,9 +1424,8 @@ class InstagramClient:
 
         Note: Requires instagram_manage_messages permission.
         """
-        fields = "id,from,to,message,created_time,attachments"
         params = {
-            "fields": f"messages{{" + fields + "}}",
+            "fields": CONVERSATION_MESSAGES_FIELDS,
             "limit": min(limit, 100)
         }
 
@@ -593,25 +1436,16 @@ class InstagramClient:
                 params=params,
                 use_facebook_api=True  # DMs use graph.facebook.com
             )
-            messages = []
-
-            for item in data.get("messages", {}).get("data", []):
-                messages.append(InstagramMessage(**item))
+            messages = _MESSAGE_LIST_ADAPTER.validate_python(
+                data.get("messages", {}).get("data", [])
+            )
 
             logger.info(f"Retrieved {len(messages)} messages from conversation {conversation_id}")
             return messages
 
         except InstagramAPIError as e:
             logger.error("Failed to get conversation messages", error=str(e), conversation_id=conversation_id)
-            error_msg = str(e)
-            # Detect Advanced Access permission error
-            if "#2" in error_msg or "unavailable" in error_msg.lower() or "temporarily" in error_msg.lower():
-                error_msg += (
-                    "\n\n⚠️  This error indicates that instagram_manage_messages permission "
-                    "requires Advanced Access from Meta via App Review. "
-                    "\n📖 See INSTAGRAM_DM_SETUP.md for the complete approval process."
-                )
-            raise InstagramAPIError(error_msg)
+            raise InstagramAPIError(_augment_advanced_access_error(str(e)))
         except Exception as e:
             logger.error("Failed to get conversation messages", error=str(e), conversation_id=conversation_id)
             raise InstagramAPIError(f"Failed to get conversation messages: {str(e)}")
@@ -651,32 +1485,33 @@ class InstagramClient:
 
         except InstagramAPIError as e:
             logger.error("Failed to send DM", error=str(e), recipient=request.recipient_id)
-            error_msg = str(e)
-            # Detect Advanced Access permission error
-            if (
-                "#2" in error_msg
-                or "unavailable" in error_msg.lower()
-                or "temporarily" in error_msg.lower()
-                or "permissions" in error_msg.lower()
-                or "access" in error_msg.lower()
-            ):
-                error_msg += (
-                    "\n\n⚠️  This error indicates that instagram_manage_messages permission "
-                    "requires Advanced Access from Meta via App Review. "
-                    "\n📖 See INSTAGRAM_DM_SETUP.md for the complete approval process."
-                )
-            raise InstagramAPIError(error_msg)
+            raise InstagramAPIError(
+                _augment_advanced_access_error(str(e), _SEND_DM_ACCESS_ERROR_RE)
+            )
         except Exception as e:
             logger.error("Failed to send DM", error=str(e), recipient=request.recipient_id)
             raise InstagramAPIError(f"Failed to send DM: {str(e)}")
 
     def get_rate_limit_info(self) -> RateLimitInfo:
-        """Get current rate limit information."""
-        # This is a simplified implementation
-        # In a real implementation, you'd track actual usage
+        """
+        Get current rate limit information.
+
+        Usage values are the percentages from the latest X-App-Usage header,
+        or 0 before the API has reported any.
+        """
+        usage = self._app_usage
         return RateLimitInfo(
             app_id=self.settings.facebook_app_id,
-            call_count=0,  # Would track actual calls
-            total_cputime=0,
-            total_time=0,
+            call_count=usage.get("call_count", 0),
+            total_cputime=usage.get("total_cputime", 0),
+            total_time=usage.get("total_time", 0),
         )
+
+
+async def shutdown() -> None:
+    """Close the shared HTTP client, e.g. when the server exits."""
+    client = InstagramClient._shared_client
+    InstagramClient._shared_client = None
+    InstagramClient._shared_client_refs = 0
+    if client is not None and not client.is_closed:
+        await client.aclose()
@@ -8,32 +8,89 @@ enabling AI applications to manage Instagram business accounts programmatically.
 
 import asyncio
 import json
+import re
 import sys
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence
 
 import structlog
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
 from mcp.server import Server
-from mcp.server.lowlevel.server import NotificationOptions
-from mcp.server.models import InitializationOptions
-from mcp.server.stdio import stdio_server
 from mcp.types import Prompt, Resource, TextContent, Tool
+from pydantic import TypeAdapter
 
 from .config import get_settings
 from .instagram_client import InstagramAPIError, InstagramClient
+from .instagram_client import shutdown as shutdown_http_client
 from .models.instagram_models import (
+    AccountInsight,
+    FacebookPage,
     InsightMetric,
     InsightPeriod,
+    InstagramMedia,
     MCPToolResult,
+    MediaInsight,
     PublishMediaRequest,
+    SendDMRequest,
 )
 
+# orjson is optional; it serializes plain payloads several times faster
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        """Serialize a response payload as indented JSON."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:
+
+    def _dumps(obj: Any) -> str:
+        """Serialize a response payload as indented JSON."""
+        return json.dumps(obj, indent=2)
+
+
+# Serialize whole result lists with one compiled serializer each
+_MEDIA_LIST = TypeAdapter(List[InstagramMedia])
+_MEDIA_INSIGHT_LIST = TypeAdapter(List[MediaInsight])
+_ACCOUNT_INSIGHT_LIST = TypeAdapter(List[AccountInsight])
+_PAGE_LIST = TypeAdapter(List[FacebookPage])
+
+# Tool results with a list longer than this are serialized compactly in a
+# worker thread so the event loop keeps serving other calls; dropping the
+# indentation makes e.g. 100 posts roughly a third smaller
+_OFFLOAD_MIN_ITEMS = 25
+
+
+def _serialize_result(result: MCPToolResult, indent: bool = True) -> str:
+    """Serialize a tool result as JSON.
+
+    Tool handlers put models into the result as-is, so pydantic-core
+    serializes the whole result in one pass.
+    """
+    return result.model_dump_json(indent=2 if indent else None)
+
+
+def _is_large_result(result: MCPToolResult) -> bool:
+    """Whether a tool result is big enough to serialize off the event loop."""
+    return bool(result.data) and any(
+        isinstance(value, list) and len(value) > _OFFLOAD_MIN_ITEMS
+        for value in result.data.values()
+    )
+
+
+# Tool arguments arrive as strings; the enum value sets are small and fixed,
+# and invalid values raise without being cached
+_insight_metric = lru_cache(maxsize=None)(InsightMetric)
+_insight_period = lru_cache(maxsize=None)(InsightPeriod)
+
+# Hashtags in post captions; \w is Unicode-aware, so non-Latin tags match
+_HASHTAG_RE = re.compile(r"#\w+")
+
 # Configure logging
 logger = structlog.get_logger(__name__)
 
-# Global Instagram client
-instagram_client: Optional[InstagramClient] = None
-
 
 class InstagramMCPServer:
     """Instagram MCP Server implementation."""
@@ -41,461 +98,330 @@ class InstagramMCPServer:
     def __init__(self):
         self.settings = get_settings()
         self.server = Server(self.settings.mcp_server_name)
+        # One client, and so one pooled HTTP/2 session, for every handler
+        self.client = InstagramClient()
         self._setup_handlers()
 
     def _setup_handlers(self):
         """Set up MCP server handlers."""
 
-        # Tools
-        @self.server.list_tools()
-        async def handle_list_tools() -> List[Tool]:
-            """List available tools."""
-            return [
-                Tool(
-                    name="get_profile_info",
-                    description=(
-                        "Get Instagram business profile information including "
-                        "followers, bio, and account details"
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "account_id": {
-                                "type": "string",
-                                "description": (
-                                    "Instagram business account ID (optional, "
-                                    "uses configured account if not provided)"
-                                ),
-                            }
-                        },
+        # Tools. The tool, resource and prompt listings are static, so they
+        # are built once here and returned as-is by the list handlers.
+        self._tools = [
+            Tool(
+                name="get_profile_info",
+                description=(
+                    "Get Instagram business profile information including "
+                    "followers, bio, and account details"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "account_id": {
+                            "type": "string",
+                            "description": (
+                                "Instagram business account ID (optional, "
+                                "uses configured account if not provided)"
+                            ),
+                        }
                     },
+                },
+            ),
+            Tool(
+                name="get_media_posts",
+                description=(
+                    "Get recent media posts from Instagram account "
+                    "with engagement metrics"
                 ),
-                Tool(
-                    name="get_media_posts",
-                    description=(
-                        "Get recent media posts from Instagram account "
-                        "with engagement metrics"
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "account_id": {
-                                "type": "string",
-                                "description": "Instagram business account ID (optional)",
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Number of posts to retrieve (max 100)",
-                                "minimum": 1,
-                                "maximum": 100,
-                                "default": 25,
-                            },
-                            "after": {
-                                "type": "string",
-                                "description": (
-                                    "Pagination cursor for getting posts "
-                                    "after a specific point"
-                                ),
-                            },
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "account_id": {
+                            "type": "string",
+                            "description": "Instagram business account ID (optional)",
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Number of posts to retrieve (max 100)",
+                            "minimum": 1,
+                            "maximum": 100,
+                            "default": 25,
+                        },
+                        "after": {
+                            "type": "string",
+                            "description": (
+                                "Pagination cursor for getting posts "
+                                "after a specific point"
+                            ),
+                        },
+                        "fields": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": (
+                                "Media fields to return (optional, returns "
+                                "all standard fields if not specified)"
+                            ),
                         },
                     },
+                },
+            ),
+            Tool(
+                name="get_media_insights",
+                description=(
+                    "Get detailed insights and analytics for a "
+                    "specific Instagram post"
                 ),
-                Tool(
-                    name="get_media_insights",
-                    description=(
-                        "Get detailed insights and analytics for a "
-                        "specific Instagram post"
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "media_id": {
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "media_id": {
+                            "type": "string",
+                            "description": "Instagram media ID to get insights for",
+                        },
+                        "metrics": {
+                            "type": "array",
+                            "items": {
                                 "type": "string",
-                                "description": "Instagram media ID to get insights for",
-                            },
-                            "metrics": {
-                                "type": "array",
-                                "items": {
-                                    "type": "string",
-                                    "enum": [
-                                        "reach",
-                                        "likes",
-                                        "comments",
-                                        "shares",
-                                        "saved",
-                                        "video_views",
-                                    ],
-                                },
-                                "description": (
-                                    "Specific metrics to retrieve (optional, "
-                                    "gets all available if not specified). "
-                                    "Note: video_views only works for video posts"
-                                ),
+                                "enum": [
+                                    "reach",
+                                    "likes",
+                                    "comments",
+                                    "shares",
+                                    "saved",
+                                    "video_views",
+                                ],
                             },
+                            "description": (
+                                "Specific metrics to retrieve (optional, "
+                                "gets all available if not specified). "
+                                "Note: video_views only works for video posts"
+                            ),
                         },
-                        "required": ["media_id"],
                     },
+                    "required": ["media_id"],
+                },
+            ),
+            Tool(
+                name="publish_media",
+                description=(
+                    "Upload and publish an image or video to Instagram "
+                    "with caption and optional location"
                 ),
-                Tool(
-                    name="publish_media",
-                    description=(
-                        "Upload and publish an image or video to Instagram "
-                        "with caption and optional location"
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "image_url": {
-                                "type": "string",
-                                "format": "uri",
-                                "description": (
-                                    "URL of the image to publish "
-                                    "(must be publicly accessible)"
-                                ),
-                            },
-                            "video_url": {
-                                "type": "string",
-                                "format": "uri",
-                                "description": (
-                                    "URL of the video to publish "
-                                    "(must be publicly accessible)"
-                                ),
-                            },
-                            "caption": {
-                                "type": "string",
-                                "description": "Caption for the post (optional)",
-                            },
-                            "location_id": {
-                                "type": "string",
-                                "description": (
-                                    "Facebook location ID for geotagging (optional)"
-                                ),
-                            },
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "image_url": {
+                            "type": "string",
+                            "format": "uri",
+                            "description": (
+                                "URL of the image to publish "
+                                "(must be publicly accessible)"
+                            ),
+                        },
+                        "video_url": {
+                            "type": "string",
+                            "format": "uri",
+                            "description": (
+                                "URL of the video to publish "
+                                "(must be publicly accessible)"
+                            ),
+                        },
+                        "caption": {
+                            "type": "string",
+                            "description": "Caption for the post (optional)",
+                        },
+                        "location_id": {
+                            "type": "string",
+                            "description": (
+                                "Facebook location ID for geotagging (optional)"
+                            ),
                         },
-                        "anyOf": [
-                            {"required": ["image_url"]},
-                            {"required": ["video_url"]},
-                        ],
                     },
+                    "anyOf": [
+                        {"required": ["image_url"]},
+                        {"required": ["video_url"]},
+                    ],
+                },
+            ),
+            Tool(
+                name="get_account_pages",
+                description=(
+                    "Get Facebook pages connected to the account and "
+                    "their Instagram business accounts"
                 ),
-                Tool(
-                    name="get_account_pages",
-                    description=(
-                        "Get Facebook pages connected to the account and "
-                        "their Instagram business accounts"
-                    ),
-                    inputSchema={"type": "object", "properties": {}},
+                inputSchema={"type": "object", "properties": {}},
+            ),
+            Tool(
+                name="get_account_insights",
+                description=(
+                    "Get account-level insights and analytics for "
+                    "Instagram business account"
                 ),
-                Tool(
-                    name="get_account_insights",
-                    description=(
-                        "Get account-level insights and analytics for "
-                        "Instagram business account"
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "account_id": {
-                                "type": "string",
-                                "description": "Instagram business account ID (optional)",
-                            },
-                            "metrics": {
-                                "type": "array",
-                                "items": {
-                                    "type": "string",
-                                    "enum": [
-                                        "reach",
-                                        "profile_views",
-                                        "website_clicks",
-                                        "accounts_engaged",
-                                    ],
-                                },
-                                "description": "Specific metrics to retrieve (Note: follower_count is available via get_profile_info)",
-                            },
-                            "period": {
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "account_id": {
+                            "type": "string",
+                            "description": "Instagram business account ID (optional)",
+                        },
+                        "metrics": {
+                            "type": "array",
+                            "items": {
                                 "type": "string",
-                                "enum": ["day", "lifetime"],
-                                "description": "Time period for insights (day for engagement metrics, lifetime for demographics)",
-                                "default": "day",
+                                "enum": [
+                                    "reach",
+                                    "profile_views",
+                                    "website_clicks",
+                                    "accounts_engaged",
+                                ],
                             },
+                            "description": "Specific metrics to retrieve (Note: follower_count is available via get_profile_info)",
+                        },
+                        "period": {
+                            "type": "string",
+                            "enum": ["day", "lifetime"],
+                            "description": "Time period for insights (day for engagement metrics, lifetime for demographics)",
+                            "default": "day",
                         },
                     },
+                },
+            ),
+            Tool(
+                name="validate_access_token",
+                description=(
+                    "Validate the Instagram API access token and "
+                    "check permissions"
                 ),
-                Tool(
-                    name="validate_access_token",
-                    description=(
-                        "Validate the Instagram API access token and "
-                        "check permissions"
-                    ),
-                    inputSchema={"type": "object", "properties": {}},
+                inputSchema={"type": "object", "properties": {}},
+            ),
+            Tool(
+                name="get_conversations",
+                description=(
+                    "Get Instagram DM conversations. "
+                    "Requires instagram_manage_messages permission. "
+                    "Lists all conversations for the connected Instagram account."
                 ),
-                Tool(
-                    name="get_conversations",
-                    description=(
-                        "Get Instagram DM conversations. "
-                        "Requires instagram_manage_messages permission. "
-                        "Lists all conversations for the connected Instagram account."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "page_id": {
-                                "type": "string",
-                                "description": (
-                                    "Facebook page ID (optional, auto-detected from "
-                                    "connected pages if not provided)"
-                                ),
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Number of conversations to retrieve (max 100)",
-                                "minimum": 1,
-                                "maximum": 100,
-                                "default": 25,
-                            },
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "page_id": {
+                            "type": "string",
+                            "description": (
+                                "Facebook page ID (optional, auto-detected from "
+                                "connected pages if not provided)"
+                            ),
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Number of conversations to retrieve (max 100)",
+                            "minimum": 1,
+                            "maximum": 100,
+                            "default": 25,
+                        },
+                        "include_messages": {
+                            "type": "boolean",
+                            "description": (
+                                "Include each conversation's messages in the "
+                                "same request"
+                            ),
+                            "default": False,
                         },
                     },
+                },
+            ),
+            Tool(
+                name="get_conversation_messages",
+                description=(
+                    "Get messages from a specific Instagram DM conversation. "
+                    "Requires instagram_manage_messages permission. "
+                    "Use get_conversations to get conversation IDs."
                 ),
-                Tool(
-                    name="get_conversation_messages",
-                    description=(
-                        "Get messages from a specific Instagram DM conversation. "
-                        "Requires instagram_manage_messages permission. "
-                        "Use get_conversations to get conversation IDs."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "conversation_id": {
-                                "type": "string",
-                                "description": "Instagram conversation ID",
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Number of messages to retrieve (max 100)",
-                                "minimum": 1,
-                                "maximum": 100,
-                                "default": 25,
-                            },
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "conversation_id": {
+                            "type": "string",
+                            "description": "Instagram conversation ID",
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Number of messages to retrieve (max 100)",
+                            "minimum": 1,
+                            "maximum": 100,
+                            "default": 25,
                         },
-                        "required": ["conversation_id"],
                     },
+                    "required": ["conversation_id"],
+                },
+            ),
+            Tool(
+                name="send_dm",
+                description=(
+                    "Send Instagram direct message to a user. "
+                    "IMPORTANT: Requires instagram_manage_messages with Advanced Access from Meta. "
+                    "Can only reply within 24 hours of user's last message. "
+                    "Recipient must have initiated conversation first."
                 ),
-                Tool(
-                    name="send_dm",
-                    description=(
-                        "Send Instagram direct message to a user. "
-                        "IMPORTANT: Requires instagram_manage_messages with Advanced Access from Meta. "
-                        "Can only reply within 24 hours of user's last message. "
-                        "Recipient must have initiated conversation first."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "recipient_id": {
-                                "type": "string",
-                                "description": "Instagram Scoped User ID (IGSID) of recipient",
-                            },
-                            "message": {
-                                "type": "string",
-                                "description": "Message text to send (max 1000 characters)",
-                                "maxLength": 1000,
-                            },
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "recipient_id": {
+                            "type": "string",
+                            "description": "Instagram Scoped User ID (IGSID) of recipient",
+                        },
+                        "message": {
+                            "type": "string",
+                            "description": "Message text to send (max 1000 characters)",
+                            "maxLength": 1000,
                         },
-                        "required": ["recipient_id", "message"],
                     },
-                ),
-            ]
+                    "required": ["recipient_id", "message"],
+                },
+            ),
+        ]
+
+        @self.server.list_tools()
+        async def handle_list_tools() -> List[Tool]:
+            """List available tools."""
+            return self._tools
+
+        # Argument validators, compiled once from each tool's input schema
+        self._tool_validators = {
+            tool.name: Draft202012Validator(tool.inputSchema) for tool in self._tools
+        }
+
+        # Tool handlers by name
+        self._tool_dispatch = {
+            "get_profile_info": self._tool_get_profile_info,
+            "get_media_posts": self._tool_get_media_posts,
+            "get_media_insights": self._tool_get_media_insights,
+            "publish_media": self._tool_publish_media,
+            "get_account_pages": self._tool_get_account_pages,
+            "get_account_insights": self._tool_get_account_insights,
+            "validate_access_token": self._tool_validate_access_token,
+            "get_conversations": self._tool_get_conversations,
+            "get_conversation_messages": self._tool_get_conversation_messages,
+            "send_dm": self._tool_send_dm,
+        }
 
         @self.server.call_tool()
         async def handle_call_tool(
             name: str, arguments: Dict[str, Any]
         ) -> Sequence[TextContent]:
             """Handle tool calls."""
-            global instagram_client
-
-            if not instagram_client:
-                instagram_client = InstagramClient()
-
             try:
-                if name == "get_profile_info":
-                    account_id = arguments.get("account_id")
-                    profile = await instagram_client.get_profile_info(account_id)
-
-                    result = MCPToolResult(
-                        success=True,
-                        data=profile.model_dump(mode='json'),
-                        metadata={
-                            "tool": name,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        },
-                    )
-
-                elif name == "get_media_posts":
-                    account_id = arguments.get("account_id")
-                    limit = arguments.get("limit", 25)
-                    after = arguments.get("after")
-
-                    posts = await instagram_client.get_media_posts(
-                        account_id, limit, after
-                    )
-
-                    result = MCPToolResult(
-                        success=True,
-                        data={
-                            "posts": [post.model_dump(mode='json') for post in posts],
-                            "count": len(posts),
-                        },
-                        metadata={
-                            "tool": name,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        },
-                    )
-
-                elif name == "get_media_insights":
-                    media_id = arguments["media_id"]
-                    metrics = arguments.get("metrics")
-
-                    if metrics:
-                        metrics = [InsightMetric(m) for m in metrics]
-
-                    insights = await instagram_client.get_media_insights(
-                        media_id, metrics
-                    )
-
-                    result = MCPToolResult(
-                        success=True,
-                        data={
-                            "media_id": media_id,
-                            "insights": [insight.model_dump(mode='json') for insight in insights],
-                        },
-                        metadata={
-                            "tool": name,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        },
-                    )
-
-                elif name == "publish_media":
-                    request = PublishMediaRequest(**arguments)
-                    response = await instagram_client.publish_media(request)
-
-                    result = MCPToolResult(
-                        success=True,
-                        data=response.model_dump(mode='json'),
-                        metadata={
-                            "tool": name,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        },
-                    )
-
-                elif name == "get_account_pages":
-                    pages = await instagram_client.get_account_pages()
-
-                    result = MCPToolResult(
-                        success=True,
-                        data={
-                            "pages": [page.model_dump(mode='json') for page in pages],
-                            "count": len(pages),
-                        },
-                        metadata={
-                            "tool": name,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        },
-                    )
-
-                elif name == "get_account_insights":
-                    account_id = arguments.get("account_id")
-                    metrics = arguments.get("metrics")
-                    period = InsightPeriod(arguments.get("period", "day"))
-
-                    insights = await instagram_client.get_account_insights(
-                        account_id, metrics, period
-                    )
-
-                    result = MCPToolResult(
-                        success=True,
-                        data={
-                            "insights": [insight.model_dump(mode='json') for insight in insights],
-                            "period": period.value,
-                        },
-                        metadata={
-                            "tool": name,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        },
-                    )
-
-                elif name == "validate_access_token":
-                    is_valid = await instagram_client.validate_access_token()
-
-                    result = MCPToolResult(
-                        success=True,
-                        data={"valid": is_valid},
-                        metadata={
-                            "tool": name,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        },
-                    )
-
-                elif name == "get_conversations":
-                    page_id = arguments.get("page_id")
-                    limit = arguments.get("limit", 25)
-
-                    conversations = await instagram_client.get_conversations(
-                        page_id, limit
-                    )
-
-                    result = MCPToolResult(
-                        success=True,
-                        data={
-                            "conversations": [conv.model_dump(mode='json') for conv in conversations],
-                            "count": len(conversations),
-                        },
-                        metadata={
-                            "tool": name,
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "note": "Requires instagram_manage_messages permission"
-                        },
-                    )
-
-                elif name == "get_conversation_messages":
-                    conversation_id = arguments["conversation_id"]
-                    limit = arguments.get("limit", 25)
-
-                    messages = await instagram_client.get_conversation_messages(
-                        conversation_id, limit
-                    )
-
-                    result = MCPToolResult(
-                        success=True,
-                        data={
-                            "conversation_id": conversation_id,
-                            "messages": [msg.model_dump(mode='json') for msg in messages],
-                            "count": len(messages),
-                        },
-                        metadata={
-                            "tool": name,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        },
-                    )
-
-                elif name == "send_dm":
-                    from .models.instagram_models import SendDMRequest
-
-                    request = SendDMRequest(**arguments)
-                    response = await instagram_client.send_dm(request)
-
-                    result = MCPToolResult(
-                        success=True,
-                        data=response.model_dump(mode='json'),
-                        metadata={
-                            "tool": name,
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "note": "24-hour response window applies. Requires Advanced Access."
-                        },
-                    )
-
-                else:
+                handler = self._tool_dispatch.get(name)
+                if handler is None:
                     result = MCPToolResult(success=False, error=f"Unknown tool: {name}")
+                else:
+                    validator = self._tool_validators[name]
+                    error = best_match(validator.iter_errors(arguments))
+                    if error is not None:
+                        result = MCPToolResult(
+                            success=False, error=f"Invalid arguments: {error.message}"
+                        )
+                    else:
+                        result = await handler(arguments)
 
             except InstagramAPIError as e:
                 logger.error("Instagram API error", tool=name, error=str(e))
@@ -514,131 +440,128 @@ class InstagramMCPServer:
                     success=False, error=f"Tool execution failed: {str(e)}"
                 )
 
-            return [TextContent(type="text", text=json.dumps(result.model_dump(mode='json'), indent=2))]
+            if _is_large_result(result):
+                text = await asyncio.to_thread(_serialize_result, result, False)
+            else:
+                text = _serialize_result(result)
+            # The text is server-generated, so skip TextContent validation
+            return [TextContent.model_construct(type="text", text=text)]
 
         # Resources
+        self._resources = [
+            Resource(
+                uri="instagram://profile",
+                name="Instagram Profile",
+                description="Current Instagram business profile information",
+                mimeType="application/json",
+            ),
+            Resource(
+                uri="instagram://media/recent",
+                name="Recent Media Posts",
+                description="Recent Instagram posts with engagement metrics",
+                mimeType="application/json",
+            ),
+            Resource(
+                uri="instagram://insights/account",
+                name="Account Insights",
+                description="Account-level analytics and insights",
+                mimeType="application/json",
+            ),
+            Resource(
+                uri="instagram://pages",
+                name="Connected Pages",
+                description="Facebook pages connected to the account",
+                mimeType="application/json",
+            ),
+        ]
+
         @self.server.list_resources()
         async def handle_list_resources() -> List[Resource]:
             """List available resources."""
-            return [
-                Resource(
-                    uri="instagram://profile",
-                    name="Instagram Profile",
-                    description="Current Instagram business profile information",
-                    mimeType="application/json",
-                ),
-                Resource(
-                    uri="instagram://media/recent",
-                    name="Recent Media Posts",
-                    description="Recent Instagram posts with engagement metrics",
-                    mimeType="application/json",
-                ),
-                Resource(
-                    uri="instagram://insights/account",
-                    name="Account Insights",
-                    description="Account-level analytics and insights",
-                    mimeType="application/json",
-                ),
-                Resource(
-                    uri="instagram://pages",
-                    name="Connected Pages",
-                    description="Facebook pages connected to the account",
-                    mimeType="application/json",
-                ),
-            ]
+            return self._resources
 
         @self.server.read_resource()
         async def handle_read_resource(uri: str) -> str:
             """Handle resource reading."""
-            global instagram_client
-
-            if not instagram_client:
-                instagram_client = InstagramClient()
-
             try:
                 if uri == "instagram://profile":
-                    profile = await instagram_client.get_profile_info()
-                    return json.dumps(profile.model_dump(mode='json'), indent=2)
+                    profile = await self.client.get_profile_info()
+                    return profile.model_dump_json(indent=2)
 
                 elif uri == "instagram://media/recent":
-                    posts = await instagram_client.get_media_posts(limit=10)
-                    return json.dumps([post.model_dump(mode='json') for post in posts], indent=2)
+                    posts = await self.client.get_media_posts(limit=10)
+                    return _MEDIA_LIST.dump_json(posts, indent=2).decode()
 
                 elif uri == "instagram://insights/account":
-                    insights = await instagram_client.get_account_insights()
-                    return json.dumps(
-                        [insight.model_dump(mode='json') for insight in insights], indent=2
-                    )
+                    insights = await self.client.get_account_insights()
+                    return _ACCOUNT_INSIGHT_LIST.dump_json(insights, indent=2).decode()
 
                 elif uri == "instagram://pages":
-                    pages = await instagram_client.get_account_pages()
-                    return json.dumps([page.model_dump(mode='json') for page in pages], indent=2)
+                    pages = await self.client.get_account_pages()
+                    return _PAGE_LIST.dump_json(pages, indent=2).decode()
 
                 else:
                     raise ValueError(f"Unknown resource URI: {uri}")
 
             except Exception as e:
                 logger.error("Resource read error", uri=uri, error=str(e))
-                return json.dumps({"error": str(e)}, indent=2)
+                return _dumps({"error": str(e)})
 
         # Prompts
+        self._prompts = [
+            Prompt(
+                name="analyze_engagement",
+                description="Analyze Instagram post engagement and provide insights",
+                arguments=[
+                    {
+                        "name": "media_id",
+                        "description": "Instagram media ID to analyze",
+                        "required": True,
+                    },
+                    {
+                        "name": "comparison_period",
+                        "description": "Period to compare against (e.g., 'last_week', 'last_month')",
+                        "required": False,
+                    },
+                ],
+            ),
+            Prompt(
+                name="content_strategy",
+                description="Generate content strategy recommendations based on account performance",
+                arguments=[
+                    {
+                        "name": "focus_area",
+                        "description": "Area to focus on (e.g., 'engagement', 'reach', 'growth')",
+                        "required": False,
+                    },
+                    {
+                        "name": "time_period",
+                        "description": "Time period to analyze (e.g., 'week', 'month')",
+                        "required": False,
+                    },
+                ],
+            ),
+            Prompt(
+                name="hashtag_analysis",
+                description="Analyze hashtag performance and suggest improvements",
+                arguments=[
+                    {
+                        "name": "post_count",
+                        "description": "Number of recent posts to analyze",
+                        "required": False,
+                    }
+                ],
+            ),
+        ]
+
         @self.server.list_prompts()
         async def handle_list_prompts() -> List[Prompt]:
             """List available prompts."""
-            return [
-                Prompt(
-                    name="analyze_engagement",
-                    description="Analyze Instagram post engagement and provide insights",
-                    arguments=[
-                        {
-                            "name": "media_id",
-                            "description": "Instagram media ID to analyze",
-                            "required": True,
-                        },
-                        {
-                            "name": "comparison_period",
-                            "description": "Period to compare against (e.g., 'last_week', 'last_month')",
-                            "required": False,
-                        },
-                    ],
-                ),
-                Prompt(
-                    name="content_strategy",
-                    description="Generate content strategy recommendations based on account performance",
-                    arguments=[
-                        {
-                            "name": "focus_area",
-                            "description": "Area to focus on (e.g., 'engagement', 'reach', 'growth')",
-                            "required": False,
-                        },
-                        {
-                            "name": "time_period",
-                            "description": "Time period to analyze (e.g., 'week', 'month')",
-                            "required": False,
-                        },
-                    ],
-                ),
-                Prompt(
-                    name="hashtag_analysis",
-                    description="Analyze hashtag performance and suggest improvements",
-                    arguments=[
-                        {
-                            "name": "post_count",
-                            "description": "Number of recent posts to analyze",
-                            "required": False,
-                        }
-                    ],
-                ),
-            ]
+            return self._prompts
 
         @self.server.get_prompt()
         async def handle_get_prompt(name: str, arguments: Dict[str, str]) -> str:
             """Handle prompt requests."""
-            global instagram_client
-
-            if not instagram_client:
-                instagram_client = InstagramClient()
-
             try:
                 if name == "analyze_engagement":
                     media_id = arguments.get("media_id")
@@ -646,13 +569,13 @@ class InstagramMCPServer:
                         return "Error: media_id is required for engagement analysis"
 
                     # Get media insights
-                    insights = await instagram_client.get_media_insights(media_id)
+                    insights = await self.client.get_media_insights(media_id)
 
                     prompt = f"""
 Analyze the engagement metrics for Instagram post {media_id}:
 
 Insights Data:
-{json.dumps([insight.model_dump(mode='json') for insight in insights], indent=2)}
+{_MEDIA_INSIGHT_LIST.dump_json(insights, indent=2).decode()}
 
 Please provide:
 1. Overall engagement performance assessment
@@ -667,18 +590,20 @@ Please provide:
                     focus_area = arguments.get("focus_area", "engagement")
                     time_period = arguments.get("time_period", "week")
 
-                    # Get recent posts and account insights
-                    posts = await instagram_client.get_media_posts(limit=20)
-                    account_insights = await instagram_client.get_account_insights()
+                    # Get recent posts and account insights concurrently
+                    posts, account_insights = await asyncio.gather(
+                        self.client.get_media_posts(limit=20),
+                        self.client.get_account_insights(),
+                    )
 
                     prompt = f"""
 Generate a content strategy for Instagram focusing on {focus_area} over the {time_period}:
 
 Recent Posts Performance:
-{json.dumps([post.model_dump(mode='json') for post in posts[:5]], indent=2)}
+{_MEDIA_LIST.dump_json(posts[:5], indent=2).decode()}
 
 Account Insights:
-{json.dumps([insight.model_dump(mode='json') for insight in account_insights], indent=2)}
+{_ACCOUNT_INSIGHT_LIST.dump_json(account_insights, indent=2).decode()}
 
 Please provide:
 1. Content performance analysis
@@ -694,17 +619,13 @@ Please provide:
                     post_count = int(arguments.get("post_count", "10"))
 
                     # Get recent posts
-                    posts = await instagram_client.get_media_posts(limit=post_count)
+                    posts = await self.client.get_media_posts(limit=post_count)
 
                     # Extract hashtags from captions
                     hashtags_data = []
                     for post in posts:
                         if post.caption:
-                            hashtags = [
-                                word
-                                for word in post.caption.split()
-                                if word.startswith("#")
-                            ]
+                            hashtags = _HASHTAG_RE.findall(post.caption)
                             hashtags_data.append(
                                 {
                                     "post_id": post.id,
@@ -718,7 +639,7 @@ Please provide:
 Analyze hashtag performance for the last {post_count} Instagram posts:
 
 Hashtag Data:
-{json.dumps(hashtags_data, indent=2)}
+{_dumps(hashtags_data)}
 
 Please provide:
 1. Most frequently used hashtags
@@ -737,19 +658,206 @@ Please provide:
                 logger.error("Prompt generation error", prompt=name, error=str(e))
                 return f"Error generating prompt: {str(e)}"
 
+    async def _tool_get_profile_info(self, arguments: Dict[str, Any]) -> MCPToolResult:
+        """Run the get_profile_info tool."""
+        account_id = arguments.get("account_id")
+        profile = await self.client.get_profile_info(account_id)
+
+        return MCPToolResult(
+            success=True,
+            data=dict(profile),
+            metadata={
+                "tool": "get_profile_info",
+                "timestamp": datetime.now(timezone.utc),
+            },
+        )
+
+    async def _tool_get_media_posts(self, arguments: Dict[str, Any]) -> MCPToolResult:
+        """Run the get_media_posts tool."""
+        account_id = arguments.get("account_id")
+        limit = arguments.get("limit", 25)
+        after = arguments.get("after")
+        fields = arguments.get("fields")
+
+        posts = await self.client.get_media_posts(account_id, limit, after, fields)
+
+        return MCPToolResult(
+            success=True,
+            data={
+                "posts": posts,
+                "count": len(posts),
+            },
+            metadata={
+                "tool": "get_media_posts",
+                "timestamp": datetime.now(timezone.utc),
+            },
+        )
+
+    async def _tool_get_media_insights(
+        self, arguments: Dict[str, Any]
+    ) -> MCPToolResult:
+        """Run the get_media_insights tool."""
+        media_id = arguments["media_id"]
+        metrics = arguments.get("metrics")
+
+        if metrics:
+            metrics = [_insight_metric(m) for m in metrics]
+
+        insights = await self.client.get_media_insights(media_id, metrics)
+
+        return MCPToolResult(
+            success=True,
+            data={
+                "media_id": media_id,
+                "insights": insights,
+            },
+            metadata={
+                "tool": "get_media_insights",
+                "timestamp": datetime.now(timezone.utc),
+            },
+        )
+
+    async def _tool_publish_media(self, arguments: Dict[str, Any]) -> MCPToolResult:
+        """Run the publish_media tool."""
+        request = PublishMediaRequest(**arguments)
+        response = await self.client.publish_media(request)
+
+        return MCPToolResult(
+            success=True,
+            data=dict(response),
+            metadata={
+                "tool": "publish_media",
+                "timestamp": datetime.now(timezone.utc),
+            },
+        )
+
+    async def _tool_get_account_pages(self, arguments: Dict[str, Any]) -> MCPToolResult:
+        """Run the get_account_pages tool."""
+        pages = await self.client.get_account_pages()
+
+        return MCPToolResult(
+            success=True,
+            data={
+                "pages": pages,
+                "count": len(pages),
+            },
+            metadata={
+                "tool": "get_account_pages",
+                "timestamp": datetime.now(timezone.utc),
+            },
+        )
+
+    async def _tool_get_account_insights(
+        self, arguments: Dict[str, Any]
+    ) -> MCPToolResult:
+        """Run the get_account_insights tool."""
+        account_id = arguments.get("account_id")
+        metrics = arguments.get("metrics")
+        period = _insight_period(arguments.get("period", "day"))
+
+        insights = await self.client.get_account_insights(account_id, metrics, period)
+
+        return MCPToolResult(
+            success=True,
+            data={
+                "insights": insights,
+                "period": period.value,
+            },
+            metadata={
+                "tool": "get_account_insights",
+                "timestamp": datetime.now(timezone.utc),
+            },
+        )
+
+    async def _tool_validate_access_token(
+        self, arguments: Dict[str, Any]
+    ) -> MCPToolResult:
+        """Run the validate_access_token tool."""
+        is_valid = await self.client.validate_access_token()
+
+        return MCPToolResult(
+            success=True,
+            data={"valid": is_valid},
+            metadata={
+                "tool": "validate_access_token",
+                "timestamp": datetime.now(timezone.utc),
+            },
+        )
+
+    async def _tool_get_conversations(self, arguments: Dict[str, Any]) -> MCPToolResult:
+        """Run the get_conversations tool."""
+        page_id = arguments.get("page_id")
+        limit = arguments.get("limit", 25)
+        include_messages = arguments.get("include_messages", False)
+
+        conversations = await self.client.get_conversations(
+            page_id, limit, include_messages
+        )
+
+        return MCPToolResult(
+            success=True,
+            data={
+                "conversations": conversations,
+                "count": len(conversations),
+            },
+            metadata={
+                "tool": "get_conversations",
+                "timestamp": datetime.now(timezone.utc),
+                "note": "Requires instagram_manage_messages permission",
+            },
+        )
+
+    async def _tool_get_conversation_messages(
+        self, arguments: Dict[str, Any]
+    ) -> MCPToolResult:
+        """Run the get_conversation_messages tool."""
+        conversation_id = arguments["conversation_id"]
+        limit = arguments.get("limit", 25)
+
+        messages = await self.client.get_conversation_messages(conversation_id, limit)
+
+        return MCPToolResult(
+            success=True,
+            data={
+                "conversation_id": conversation_id,
+                "messages": messages,
+                "count": len(messages),
+            },
+            metadata={
+                "tool": "get_conversation_messages",
+                "timestamp": datetime.now(timezone.utc),
+            },
+        )
+
+    async def _tool_send_dm(self, arguments: Dict[str, Any]) -> MCPToolResult:
+        """Run the send_dm tool."""
+        request = SendDMRequest(**arguments)
+        response = await self.client.send_dm(request)
+
+        return MCPToolResult(
+            success=True,
+            data=dict(response),
+            metadata={
+                "tool": "send_dm",
+                "timestamp": datetime.now(timezone.utc),
+                "note": "24-hour response window applies. Requires Advanced Access.",
+            },
+        )
+
     async def run(self):
         """Run the MCP server."""
+        # Only needed to serve over stdio, so not imported with the module
+        from mcp.server.lowlevel.server import NotificationOptions
+        from mcp.server.models import InitializationOptions
+        from mcp.server.stdio import stdio_server
+
         logger.info(
             "Starting Instagram MCP Server", version=self.settings.mcp_server_version
         )
 
-        # Initialize Instagram client
-        global instagram_client
-        instagram_client = InstagramClient()
-
         # Validate access token on startup
         try:
-            is_valid = await instagram_client.validate_access_token()
+            is_valid = await self.client.validate_access_token()
             if not is_valid:
                 logger.error("Invalid Instagram access token")
                 sys.exit(1)
@@ -759,51 +867,78 @@ Please provide:
             sys.exit(1)
 
         # Run the server
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name=self.settings.mcp_server_name,
-                    server_version=self.settings.mcp_server_version,
-                    capabilities=self.server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={}
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name=self.settings.mcp_server_name,
+                        server_version=self.settings.mcp_server_version,
+                        capabilities=self.server.get_capabilities(
+                            notification_options=NotificationOptions(),
+                            experimental_capabilities={}
+                        ),
                     ),
-                ),
-            )
+                )
+        finally:
+            await shutdown_http_client()
 
 
 async def main():
     """Main entry point."""
-    # Configure structured logging
+    import logging
+    import logging.handlers
+    import queue
+
+    settings = get_settings()
+    level = getattr(logging, settings.log_level)
+
+    # Log records are queued on the event loop thread and written to stderr
+    # by a listener thread, so handlers never block on I/O. stdout carries
+    # the MCP stdio transport.
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, logging.StreamHandler(sys.stderr)
+    )
+    logging.basicConfig(
+        level=level, handlers=[logging.handlers.QueueHandler(log_queue)]
+    )
+
+    # Render log lines with orjson when it is available
+    try:
+        import orjson
+
+        def serializer(obj: Any, **kwargs: Any) -> str:
+            return orjson.dumps(obj, **kwargs).decode()
+
+    except ImportError:
+        serializer = json.dumps
+
+    # Configure structured logging; the filtering wrapper drops calls below
+    # the configured level before any processor runs
     structlog.configure(
         processors=[
-            structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=serializer),
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         cache_logger_on_first_use=True,
     )
 
-    # Set log level
-    import logging
-
-    settings = get_settings()
-    logging.basicConfig(level=getattr(logging, settings.log_level))
-
     # Create and run server
-    server = InstagramMCPServer()
-    await server.run()
+    listener.start()
+    try:
+        server = InstagramMCPServer()
+        await server.run()
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+"""
+Rarely used Pydantic models for Instagram API data structures.
+
+The server and client never construct these, so they are kept out of
+instagram_models' import and loaded on first attribute access there.
+"""
+
+import time
+from typing import Any, Dict, FrozenSet, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+
+from .instagram_models import ALLOWED_INSIGHT_METRICS, InsightPeriod
+
+
+class InstagramError(BaseModel):
+    """Instagram API error response."""
+
+    message: str
+    type: Optional[str] = None
+    code: Optional[int] = None
+    error_subcode: Optional[int] = None
+    fbtrace_id: Optional[str] = None
+
+
+class AccountInsights(BaseModel):
+    """Instagram account insights."""
+
+    model_config = ConfigDict(extra="allow")
+
+    impressions: Optional[int] = None
+    reach: Optional[int] = None
+    profile_views: Optional[int] = None
+    website_clicks: Optional[int] = None
+    follower_count: Optional[int] = None
+    email_contacts: Optional[int] = None
+    phone_call_clicks: Optional[int] = None
+    text_message_clicks: Optional[int] = None
+    get_directions_clicks: Optional[int] = None
+
+
+class GetInsightsRequest(BaseModel):
+    """Request model for getting insights."""
+
+    media_id: str = Field(..., description="Media ID to get insights for")
+    metrics: FrozenSet[str] = Field(..., description="Metrics to retrieve")
+    period: Optional[InsightPeriod] = Field(
+        InsightPeriod.LIFETIME, description="Time period"
+    )
+
+    _metric_param: str = PrivateAttr()
+
+    @model_validator(mode="after")
+    def validate_metrics(self):
+        """Check the metrics with one set difference and join them once."""
+        unknown = self.metrics - ALLOWED_INSIGHT_METRICS
+        if unknown:
+            raise ValueError(f"Unknown insight metrics: {sorted(unknown)}")
+        self._metric_param = ",".join(sorted(self.metrics))
+        return self
+
+    @property
+    def metric_param(self) -> str:
+        """Get the metrics as the Graph API ``metric`` parameter."""
+        return self._metric_param
+
+
+class ErrorResponse(BaseModel):
+    """Error response model."""
+
+    error: Dict[str, Any] = Field(..., description="Error details")
+    message: str = Field("Unknown error", description="Error message")
+    code: int = Field(0, description="Error code")
+    error_subcode: Optional[int] = Field(None, description="Error subcode")
+
+    @model_validator(mode="before")
+    @classmethod
+    def flatten_error(cls, data):
+        """Copy the nested error details to top-level fields once."""
+        if isinstance(data, dict) and isinstance(data.get("error"), dict):
+            error = data["error"]
+            data = {
+                "message": error.get("message") or "Unknown error",
+                "code": error.get("code") or 0,
+                "error_subcode": error.get("error_subcode"),
+                **data,
+            }
+        return data
+
+
+class CacheEntry(BaseModel):
+    """Cache entry model."""
+
+    key: str = Field(..., description="Cache key")
+    value: Dict[str, Any] = Field(..., description="Cached value")
+    expires_at: float = Field(..., description="Expiration time, epoch seconds")
+    created_at: float = Field(
+        default_factory=time.time, description="Creation time, epoch seconds"
+    )
+
+    @property
+    def is_expired(self) -> bool:
+        """Check if cache entry is expired."""
+        return time.time() > self.expires_at
@@ -2,11 +2,34 @@
 Pydantic models for Instagram API data structures.
 """
 
+import sys
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    field_validator,
+    model_validator,
+)
+from typing_extensions import NotRequired, TypedDict
+
+# ciso8601 is optional; it parses ISO 8601 timestamps much faster in C
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    if sys.version_info >= (3, 11):
+        # fromisoformat accepts "Z" and "+0000" offsets from 3.11 on
+        parse_datetime = datetime.fromisoformat
+    else:
+
+        def parse_datetime(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+_HTTP_SCHEMES = ("http://", "https://")
 
 
 class MediaType(str, Enum):
@@ -31,6 +54,10 @@ class InsightMetric(str, Enum):
     WEBSITE_CLICKS = "website_clicks"
 
 
+# Valid insight metric values, so a set of metrics is checked in one pass
+ALLOWED_INSIGHT_METRICS = frozenset(metric.value for metric in InsightMetric)
+
+
 class InsightPeriod(str, Enum):
     """Insight time periods."""
 
@@ -40,7 +67,11 @@ class InsightPeriod(str, Enum):
     LIFETIME = "lifetime"
 
 
-class MediaInsight(BaseModel):
+# Insights come back in bulk and are never mutated, so they are validated
+# as plain dicts rather than constructed as model instances
+
+
+class MediaInsight(TypedDict):
     """Media insight data."""
 
     name: str
@@ -50,16 +81,16 @@ class MediaInsight(BaseModel):
     description: str
 
 
-class AccountInsight(BaseModel):
+class AccountInsight(TypedDict):
     """Account insight data - supports both time series and total value formats."""
 
     name: str
     period: str
-    values: Optional[List[Dict[str, Any]]] = None
-    total_value: Optional[Dict[str, Any]] = None
-    title: Optional[str] = None
-    description: Optional[str] = None
-    id: Optional[str] = None
+    values: NotRequired[Optional[List[Dict[str, Any]]]]
+    total_value: NotRequired[Optional[Dict[str, Any]]]
+    title: NotRequired[Optional[str]]
+    description: NotRequired[Optional[str]]
+    id: NotRequired[Optional[str]]
 
 
 class RateLimitInfo(BaseModel):
@@ -89,7 +120,9 @@ class InstagramMedia(BaseModel):
     """Instagram media post."""
 
     id: str
-    media_type: MediaType
+    # Validated as a Literal, which pydantic-core checks faster than an Enum;
+    # MediaType members are str and still compare equal to these values
+    media_type: Literal["IMAGE", "VIDEO", "CAROUSEL_ALBUM"]
     media_url: Optional[str] = None
     permalink: Optional[str] = None
     thumbnail_url: Optional[str] = None
@@ -97,13 +130,22 @@ class InstagramMedia(BaseModel):
     timestamp: Optional[datetime] = None
     like_count: Optional[int] = None
     comments_count: Optional[int] = None
+    insights: Optional[List[MediaInsight]] = None
 
     @field_validator("timestamp", mode="before")
     @classmethod
     def parse_timestamp(cls, v):
         """Parse timestamp from ISO string."""
         if isinstance(v, str):
-            return datetime.fromisoformat(v.replace("Z", "+00:00"))
+            return parse_datetime(v)
+        return v
+
+    @field_validator("insights", mode="before")
+    @classmethod
+    def unwrap_insights(cls, v):
+        """Unwrap insights expanded on the media edge ({"data": [...]})."""
+        if isinstance(v, dict):
+            return v.get("data", [])
         return v
 
 
@@ -118,27 +160,27 @@ class UserTag(BaseModel):
 class PublishMediaRequest(BaseModel):
     """Request to publish media to Instagram."""
 
-    image_url: Optional[HttpUrl] = None
-    video_url: Optional[HttpUrl] = None
+    image_url: Optional[str] = None
+    video_url: Optional[str] = None
     caption: Optional[str] = None
     location_id: Optional[str] = None
     user_tags: Optional[List[UserTag]] = None
 
-    @field_validator("image_url", "video_url")
-    @classmethod
-    def validate_media_url(cls, v, info):
-        """Validate that at least one media URL is provided."""
-        # This validator will be called for each field individually
-        # We'll validate the combination in model_validator
-        return v
-
-    @field_validator("caption")
-    @classmethod
-    def validate_caption_length(cls, v):
-        """Validate caption length."""
-        if v and len(v) > 2200:
+    @model_validator(mode="after")
+    def validate_request(self):
+        """Validate the media URLs and caption in one pass.
+
+        A media URL must be provided and be an HTTP(S) URL. The Graph API
+        fetches and validates the URL itself, so only the scheme is checked.
+        """
+        if not (self.image_url or self.video_url):
+            raise ValueError("Either image_url or video_url is required")
+        for url in (self.image_url, self.video_url):
+            if url and not url.startswith(_HTTP_SCHEMES):
+                raise ValueError("Media URLs must start with http:// or https://")
+        if self.caption and len(self.caption) > 2200:
             raise ValueError("Caption must be 2200 characters or less")
-        return v
+        return self
 
 
 class PublishMediaResponse(BaseModel):
@@ -148,16 +190,6 @@ class PublishMediaResponse(BaseModel):
     status: str = "published"
 
 
-class InstagramError(BaseModel):
-    """Instagram API error response."""
-
-    message: str
-    type: Optional[str] = None
-    code: Optional[int] = None
-    error_subcode: Optional[int] = None
-    fbtrace_id: Optional[str] = None
-
-
 class FacebookPage(BaseModel):
     """Facebook page information."""
 
@@ -168,53 +200,6 @@ class FacebookPage(BaseModel):
     instagram_business_account: Optional[Dict[str, str]] = None
 
 
-class AccountInsights(BaseModel):
-    """Instagram account insights."""
-
-    model_config = ConfigDict(extra="allow")
-
-    impressions: Optional[int] = None
-    reach: Optional[int] = None
-    profile_views: Optional[int] = None
-    website_clicks: Optional[int] = None
-    follower_count: Optional[int] = None
-    email_contacts: Optional[int] = None
-    phone_call_clicks: Optional[int] = None
-    text_message_clicks: Optional[int] = None
-    get_directions_clicks: Optional[int] = None
-
-
-class GetInsightsRequest(BaseModel):
-    """Request model for getting insights."""
-
-    media_id: str = Field(..., description="Media ID to get insights for")
-    metrics: List[InsightMetric] = Field(..., description="Metrics to retrieve")
-    period: Optional[InsightPeriod] = Field(
-        InsightPeriod.LIFETIME, description="Time period"
-    )
-
-
-class ErrorResponse(BaseModel):
-    """Error response model."""
-
-    error: Dict[str, Any] = Field(..., description="Error details")
-
-    @property
-    def message(self) -> str:
-        """Get error message."""
-        return self.error.get("message", "Unknown error")
-
-    @property
-    def code(self) -> int:
-        """Get error code."""
-        return self.error.get("code", 0)
-
-    @property
-    def error_subcode(self) -> Optional[int]:
-        """Get error subcode."""
-        return self.error.get("error_subcode")
-
-
 class MCPToolResult(BaseModel):
     """MCP tool execution result."""
 
@@ -224,22 +209,6 @@ class MCPToolResult(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
 
-class CacheEntry(BaseModel):
-    """Cache entry model."""
-
-    key: str = Field(..., description="Cache key")
-    value: Dict[str, Any] = Field(..., description="Cached value")
-    expires_at: datetime = Field(..., description="Expiration timestamp")
-    created_at: datetime = Field(
-        default_factory=datetime.utcnow, description="Creation timestamp"
-    )
-
-    @property
-    def is_expired(self) -> bool:
-        """Check if cache entry is expired."""
-        return datetime.utcnow() > self.expires_at
-
-
 class InstagramMessage(BaseModel):
     """Instagram direct message."""
 
@@ -257,7 +226,7 @@ class InstagramMessage(BaseModel):
     def parse_created_time(cls, v):
         """Parse timestamp from ISO string."""
         if isinstance(v, str):
-            return datetime.fromisoformat(v.replace("Z", "+00:00"))
+            return parse_datetime(v)
         return v
 
 
@@ -275,7 +244,7 @@ class InstagramConversation(BaseModel):
     def parse_updated_time(cls, v):
         """Parse timestamp from ISO string."""
         if isinstance(v, str):
-            return datetime.fromisoformat(v.replace("Z", "+00:00"))
+            return parse_datetime(v)
         return v
 
 
@@ -305,3 +274,23 @@ class SendDMResponse(BaseModel):
     message_id: str
     recipient_id: str
     success: bool = True
+
+
+# Models the server never builds live in _rare and are imported on first use
+_RARE_MODELS = frozenset(
+    (
+        "AccountInsights",
+        "CacheEntry",
+        "ErrorResponse",
+        "GetInsightsRequest",
+        "InstagramError",
+    )
+)
+
+
+def __getattr__(name: str):
+    if name in _RARE_MODELS:
+        from . import _rare
+
+        return getattr(_rare, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
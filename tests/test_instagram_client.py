@@ -3,6 +3,9 @@ Unit tests for Instagram API client.
 """
 
 import asyncio
+import json
+import struct
+from contextlib import asynccontextmanager
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -17,16 +20,29 @@ def mock_settings():
     settings = MagicMock()
     settings.instagram_api_url = "https://graph.facebook.com/v19.0"
     settings.instagram_access_token = "test_token"
+    settings.facebook_app_id = "test_app_id"
     settings.instagram_business_account_id = "test_account_id"
     settings.rate_limit_requests_per_hour = 200
+    settings.rate_limit_enable_backoff = True
+    settings.rate_limit_max_retries = 2
     settings.cache_enabled = True
     settings.cache_ttl_seconds = 300
+    settings.cache_max_entries = 1000
+    settings.cache_error_ttl_seconds = 30
+    settings.redis_cache_enabled = False
 
     with patch("src.instagram_client.get_settings", return_value=settings):
         yield settings
 
 
-from src.instagram_client import InstagramAPIError, InstagramClient, RateLimitExceeded
+from src.instagram_client import (
+    AccessTokenAuth,
+    InstagramAPIError,
+    InstagramClient,
+    RateLimitExceeded,
+    TokenBucket,
+    parse_image_size,
+)
 from src.models.instagram_models import (
     InsightMetric,
     InstagramMedia,
@@ -37,6 +53,36 @@ from src.models.instagram_models import (
 )
 
 
+def make_http_response(status_code, payload):
+    """Create a mock HTTP response with a JSON body."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = json.dumps(payload).encode()
+    response.headers = {}
+    return response
+
+
+def make_stream(chunks, status_code=206):
+    """Create a mock client.stream() serving body chunks; also returns the
+    list of chunks actually read."""
+    reads = []
+    response = MagicMock()
+    response.status_code = status_code
+
+    async def aiter_bytes(chunk_size=None):
+        for chunk in chunks:
+            reads.append(chunk)
+            yield chunk
+
+    response.aiter_bytes = aiter_bytes
+
+    @asynccontextmanager
+    async def stream(method, url, headers=None):
+        yield response
+
+    return MagicMock(side_effect=stream), reads
+
+
 @pytest.fixture
 def instagram_client(mock_settings):
     """Create Instagram client for testing."""
@@ -129,6 +175,52 @@ class TestInstagramClient:
         # Verify timestamp conversion
         assert isinstance(posts[0].timestamp, datetime)
 
+    @pytest.mark.asyncio
+    async def test_get_media_posts_with_fields(self, instagram_client):
+        """Test that requested fields are forwarded to the API."""
+        instagram_client._make_request = AsyncMock(return_value={"data": []})
+
+        await instagram_client.get_media_posts(fields=["caption", "like_count"])
+
+        params = instagram_client._make_request.call_args.kwargs["params"]
+        assert params["fields"] == "id,media_type,caption,like_count"
+
+    @pytest.mark.asyncio
+    async def test_get_conversations_with_messages(self, instagram_client):
+        """Test that messages are expanded in the conversations request."""
+        mock_response = {
+            "data": [
+                {
+                    "id": "conv_1",
+                    "updated_time": "2024-01-01T12:00:00+00:00",
+                    "messages": {
+                        "data": [
+                            {
+                                "id": "msg_1",
+                                "from": "user_1",
+                                "to": [{"id": "page_1"}],
+                                "message": "Hello",
+                                "created_time": "2024-01-01T12:00:00+00:00",
+                            }
+                        ]
+                    },
+                }
+            ]
+        }
+
+        instagram_client._make_request = AsyncMock(return_value=mock_response)
+
+        conversations = await instagram_client.get_conversations(
+            "page_1", include_messages=True
+        )
+
+        params = instagram_client._make_request.call_args.kwargs["params"]
+        assert "messages{" in params["fields"]
+        assert instagram_client._make_request.call_count == 1
+        assert conversations[0].messages[0].message == "Hello"
+        # The (possibly cached) response is left as the API returned it
+        assert isinstance(mock_response["data"][0]["messages"], dict)
+
     @pytest.mark.asyncio
     async def test_get_media_insights_success(self, instagram_client):
         """Test successful media insights retrieval."""
@@ -159,16 +251,137 @@ class TestInstagramClient:
 
         # Assertions
         assert len(insights) == 2
-        assert insights[0].name == "impressions"
-        assert insights[1].name == "reach"
+        assert insights[0]["name"] == "impressions"
+        assert insights[1]["name"] == "reach"
 
         # Verify API call
         instagram_client._make_request.assert_called_once_with(
             "GET",
             f"test_media_id/insights",
-            params={"metric": "impressions,reach,likes,comments,shares,saves"},
+            params={"metric": "comments,likes,reach,saved,shares"},
+        )
+
+        # Naming the default metrics explicitly gives the same request
+        await instagram_client.get_media_insights(
+            "test_media_id",
+            [
+                InsightMetric.REACH,
+                InsightMetric.LIKES,
+                InsightMetric.COMMENTS,
+                InsightMetric.SHARES,
+                InsightMetric.SAVED,
+            ],
+        )
+        assert instagram_client._make_request.call_args.kwargs["params"] == {
+            "metric": "comments,likes,reach,saved,shares"
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_media_posts_with_insights(self, instagram_client):
+        """Test posts and their insights are fetched in a single request."""
+        mock_response = {
+            "data": [
+                {
+                    "id": "media_1",
+                    "media_type": "IMAGE",
+                    "timestamp": "2024-01-01T12:00:00Z",
+                    "insights": {
+                        "data": [
+                            {
+                                "name": "reach",
+                                "period": "lifetime",
+                                "values": [{"value": 800}],
+                                "title": "Reach",
+                                "description": "Total reach",
+                            }
+                        ]
+                    },
+                }
+            ]
+        }
+
+        instagram_client._make_request = AsyncMock(return_value=mock_response)
+
+        posts = await instagram_client.get_media_posts_with_insights(
+            metrics=[InsightMetric.REACH]
         )
 
+        assert len(posts) == 1
+        assert posts[0].insights[0]["name"] == "reach"
+        instagram_client._make_request.assert_called_once()
+        fields = instagram_client._make_request.call_args.kwargs["params"]["fields"]
+        assert fields.endswith(",insights.metric(reach)")
+
+    @pytest.mark.asyncio
+    async def test_get_media_insights_bulk(self, instagram_client):
+        """Test bulk media insights keep order and return failures in place."""
+        insight = {
+            "name": "reach",
+            "period": "lifetime",
+            "values": [{"value": 800}],
+            "title": "Reach",
+            "description": "Total reach",
+        }
+
+        def batch_item(request):
+            if request["relative_url"].startswith("bad"):
+                error = {"error": {"message": "Invalid media", "code": 100}}
+                return {"code": 400, "body": json.dumps(error)}
+            return {"code": 200, "body": json.dumps({"data": [insight]})}
+
+        async def fake_request(method, endpoint, params=None, data=None, cost=1):
+            if method == "POST":
+                return [batch_item(request) for request in data["batch"]]
+            return {"data": [insight]}
+
+        instagram_client._make_request = AsyncMock(side_effect=fake_request)
+
+        results = await instagram_client.get_media_insights_bulk(
+            ["media_1", "bad_media", "media_2"], concurrency=2
+        )
+
+        assert len(results) == 3
+        assert results[0][0]["name"] == "reach"
+        assert isinstance(results[1], InstagramAPIError)
+        assert results[1].error_code == 100
+        assert results[2][0]["name"] == "reach"
+
+        # One batch call covered all three posts, charged per post
+        instagram_client._make_request.assert_awaited_once()
+        assert instagram_client._make_request.call_args.kwargs["cost"] == 3
+        batch = instagram_client._make_request.call_args.kwargs["data"]["batch"]
+        assert [request["relative_url"].split("/")[0] for request in batch] == [
+            "media_1",
+            "bad_media",
+            "media_2",
+        ]
+
+        # Successful results were cached per post, so they skip the batch
+        results = await instagram_client.get_media_insights_bulk(["media_1"])
+        assert results[0][0]["name"] == "reach"
+        assert instagram_client._make_request.call_args.args[0] == "GET"
+
+    @pytest.mark.asyncio
+    async def test_get_media_insights_bulk_bad_replies(self, instagram_client):
+        """Test short, failed and malformed batch replies yield errors in place."""
+        ok = {"code": 200, "body": json.dumps({"data": []})}
+        failed = {"code": 500, "body": "{}"}
+        instagram_client._make_request = AsyncMock(return_value=[ok, failed])
+
+        results = await instagram_client.get_media_insights_bulk(["a", "b", "c"])
+
+        assert results[0] == []
+        assert isinstance(results[1], InstagramAPIError)
+        assert isinstance(results[2], InstagramAPIError)
+        # The failed reply was not cached as a success
+        assert not any(k[0] == "b/insights" for k in instagram_client._cache)
+
+        instagram_client._make_request = AsyncMock(
+            return_value={"error": {"message": "Bad batch"}}
+        )
+        results = await instagram_client.get_media_insights_bulk(["d", "e"])
+        assert all(isinstance(result, InstagramAPIError) for result in results)
+
     @pytest.mark.asyncio
     async def test_publish_media_success(self, instagram_client):
         """Test successful media publishing."""
@@ -180,6 +393,11 @@ class TestInstagramClient:
             side_effect=[container_response, publish_response]
         )
 
+        # Square PNG; the header chunk is enough to read the dimensions
+        header = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + struct.pack(">II", 1080, 1080)
+        rest = bytes(16384)
+        instagram_client.client.stream, reads = make_stream([header, rest])
+
         # Create publish request
         request = PublishMediaRequest(
             image_url="https://example.com/image.jpg", caption="Test caption"
@@ -192,6 +410,13 @@ class TestInstagramClient:
         assert response.id == "media_456"
         assert response.status == "published"
 
+        # Only the start of the image was requested, and reading stopped
+        # once the header parsed
+        instagram_client.client.stream.assert_called_once()
+        headers = instagram_client.client.stream.call_args.kwargs["headers"]
+        assert headers["Range"].startswith("bytes=0-")
+        assert reads == [header]
+
         # Verify API calls
         assert instagram_client._make_request.call_count == 2
 
@@ -207,6 +432,19 @@ class TestInstagramClient:
             "GET", "me", params={"fields": "id"}, use_cache=False
         )
 
+    @pytest.mark.asyncio
+    async def test_validate_access_token_remembers_success(self, instagram_client):
+        """Test a successful validation is reused until it expires."""
+        instagram_client._make_request = AsyncMock(return_value={"id": "test_id"})
+
+        assert await instagram_client.validate_access_token() is True
+        assert await instagram_client.validate_access_token() is True
+        assert instagram_client._make_request.call_count == 1
+
+        instagram_client._token_valid_until = 0.0
+        assert await instagram_client.validate_access_token() is True
+        assert instagram_client._make_request.call_count == 2
+
     @pytest.mark.asyncio
     async def test_validate_access_token_failure(self, instagram_client):
         """Test access token validation failure."""
@@ -222,28 +460,51 @@ class TestInstagramClient:
     async def test_rate_limit_exceeded(self, instagram_client):
         """Test rate limit handling."""
         # Mock HTTP response with 429 status
-        mock_response = MagicMock()
-        mock_response.status_code = 429
-        mock_response.json.return_value = {"error": {"message": "Rate limit exceeded"}}
+        mock_response = make_http_response(
+            429, {"error": {"message": "Rate limit exceeded"}}
+        )
 
         instagram_client.client.get = AsyncMock(return_value=mock_response)
 
-        with pytest.raises(RateLimitExceeded):
-            await instagram_client._make_request("GET", "test_endpoint")
+        with patch("src.instagram_client.asyncio.sleep", new=AsyncMock()):
+            with pytest.raises(RateLimitExceeded):
+                await instagram_client._make_request("GET", "test_endpoint")
+
+        # The first attempt plus two retries
+        assert instagram_client.client.get.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_retry_after(self, instagram_client):
+        """Test that a 429 is retried after the Retry-After delay."""
+        limited = make_http_response(429, {})
+        limited.headers = {"retry-after": "5"}
+        ok = make_http_response(200, {"data": "ok"})
+        ok.headers = {"x-app-usage": '{"call_count": 42, "total_time": 7}'}
+        instagram_client.client.get = AsyncMock(side_effect=[limited, ok])
+
+        with patch("src.instagram_client.asyncio.sleep", new=AsyncMock()) as sleep:
+            result = await instagram_client._make_request("GET", "test_endpoint")
+
+        assert result == {"data": "ok"}
+        sleep.assert_awaited_once_with(5.0)
+        info = instagram_client.get_rate_limit_info()
+        assert info.call_count == 42
+        assert info.total_time == 7
 
     @pytest.mark.asyncio
     async def test_api_error_handling(self, instagram_client):
         """Test Instagram API error handling."""
         # Mock HTTP response with API error
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "error": {
-                "message": "Invalid parameter",
-                "code": 100,
-                "error_subcode": 1234,
-            }
-        }
+        mock_response = make_http_response(
+            200,
+            {
+                "error": {
+                    "message": "Invalid parameter",
+                    "code": 100,
+                    "error_subcode": 1234,
+                }
+            },
+        )
 
         instagram_client.client.get = AsyncMock(return_value=mock_response)
 
@@ -261,29 +522,106 @@ class TestInstagramClient:
 
         key = instagram_client._get_cache_key(endpoint, params)
 
-        assert "test_endpoint" in key
-        assert "param1=value1" in key
-        assert "param2=value2" in key
+        assert key[0] == "test_endpoint"
+        assert ("param1", "value1") in key[1]
+        assert ("param2", "value2") in key[1]
+
+        # Param order doesn't affect the key
+        assert key == instagram_client._get_cache_key(
+            endpoint, {"param2": "value2", "param1": "value1"}
+        )
+
+    def test_redis_key(self, instagram_client):
+        """Test shared cache keys are fixed-size and order independent."""
+        get_key = instagram_client._get_cache_key
+        key = instagram_client._redis_key(get_key("media", {"a": "1", "b": "2"}))
 
-    def test_cache_validity_check(self, instagram_client):
-        """Test cache validity checking."""
-        from datetime import datetime, timedelta
+        assert key.startswith(instagram_client._redis_prefix)
+        assert len(key) == len(instagram_client._redis_prefix) + 32
+        assert key == instagram_client._redis_key(
+            get_key("media", {"b": "2", "a": "1"})
+        )
+        assert key != instagram_client._redis_key(get_key("media", {"a": "1"}))
 
-        # Valid cache entry
-        valid_entry = {
-            "expires_at": (datetime.utcnow() + timedelta(minutes=5)).isoformat()
+    @pytest.mark.asyncio
+    async def test_cached_response_validated_once(self, instagram_client):
+        """Test a cached response is validated once and the result reused."""
+        cached = {"data": [{"id": "1", "media_type": "IMAGE"}]}
+        instagram_client._make_request = AsyncMock(return_value=cached)
+
+        # Responses that aren't in the cache are not memoized
+        await instagram_client.get_media_posts("acct")
+        assert len(instagram_client._validated_cache) == 0
+
+        params = instagram_client._make_request.call_args.kwargs["params"]
+        key = instagram_client._get_cache_key("acct/media", params)
+        instagram_client._cache_response(key, cached, ttl=300)
+
+        first = await instagram_client.get_media_posts("acct")
+        second = await instagram_client.get_media_posts("acct")
+        assert first[0] is second[0]
+
+        # Each caller gets its own list
+        first.clear()
+        third = await instagram_client.get_media_posts("acct")
+        assert len(third) == 1
+
+        instagram_client._make_request.return_value = {
+            "data": [dict(id="2", media_type="VIDEO")]
         }
-        assert instagram_client._is_cache_valid(valid_entry) is True
+        fourth = await instagram_client.get_media_posts("acct")
+        assert fourth[0].id == "2"
+
+    @pytest.mark.asyncio
+    async def test_post_not_cached(self, instagram_client):
+        """Test a POST skips the cache, even with unhashable params."""
+        instagram_client.client.post = AsyncMock(
+            return_value=make_http_response(200, {"id": "container_1"})
+        )
+
+        result = await instagram_client._make_request(
+            "POST", "acct/media", params={"tags": ["a", "b"]}, data={"caption": "x"}
+        )
+
+        assert result == {"id": "container_1"}
+        assert len(instagram_client._cache) == 0
+
+    def test_cache_expiry(self, instagram_client):
+        """Test that expired cache entries are not returned."""
+        key = instagram_client._get_cache_key("test_endpoint", {})
+
+        instagram_client._cache_response(key, {"data": "test"}, ttl=300)
+        assert instagram_client._cache.get(key) is not None
 
         # Expired cache entry
-        expired_entry = {
-            "expires_at": (datetime.utcnow() - timedelta(minutes=5)).isoformat()
-        }
-        assert instagram_client._is_cache_valid(expired_entry) is False
+        instagram_client._cache[key] = ({"data": "test"}, 0.0, 0.0, None)
+        assert instagram_client._cache.get(key) is None
 
-        # No expiration time
-        no_expiry_entry = {}
-        assert instagram_client._is_cache_valid(no_expiry_entry) is False
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self, instagram_client):
+        """Test that a stale insights entry is returned and refreshed behind."""
+        instagram_client.client.get = AsyncMock(
+            return_value=make_http_response(200, {"data": "fresh"})
+        )
+        params = {"metric": "reach"}
+        key = instagram_client._get_cache_key("acct/insights", params)
+        # Expired, but still inside the stale window
+        instagram_client._cache[key] = ({"data": "stale"}, 0.0, float("inf"), None)
+
+        result = await instagram_client._make_request(
+            "GET", "acct/insights", params=dict(params)
+        )
+        assert result == {"data": "stale"}
+
+        # Let the background refresh finish
+        await asyncio.gather(*instagram_client._inflight.values())
+        assert instagram_client.client.get.call_count == 1
+
+        result = await instagram_client._make_request(
+            "GET", "acct/insights", params=dict(params)
+        )
+        assert result == {"data": "fresh"}
+        assert instagram_client.client.get.call_count == 1
 
     @pytest.mark.asyncio
     async def test_caching_mechanism(self, instagram_client):
@@ -291,9 +629,7 @@ class TestInstagramClient:
         mock_response = {"data": "test_data"}
 
         # Mock the client to return a successful response
-        mock_http_response = MagicMock()
-        mock_http_response.status_code = 200
-        mock_http_response.json.return_value = mock_response
+        mock_http_response = make_http_response(200, mock_response)
 
         instagram_client.client.get = AsyncMock(return_value=mock_http_response)
 
@@ -312,12 +648,137 @@ class TestInstagramClient:
         # Should only call the API once due to caching
         assert instagram_client.client.get.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_stale_entry_revalidated_with_etag(self, instagram_client):
+        """Test that a 304 reply keeps the stale data and renews it."""
+        not_modified = MagicMock(status_code=304, content=b"")
+        instagram_client.client.get = AsyncMock(return_value=not_modified)
+        key = instagram_client._get_cache_key("acct/insights", {})
+        instagram_client._cache[key] = ({"data": "stale"}, 0.0, float("inf"), '"v1"')
+
+        result = await instagram_client._make_request("GET", "acct/insights")
+        assert result == {"data": "stale"}
+        await asyncio.gather(*instagram_client._inflight.values())
+
+        headers = instagram_client.client.get.call_args.kwargs["headers"]
+        assert headers == {"If-None-Match": '"v1"'}
+        data, fresh_until, _, etag = instagram_client._cache[key]
+        assert data == {"data": "stale"}
+        assert fresh_until > 0.0
+        assert etag == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_shared_redis_cache(self, instagram_client):
+        """Test the Redis tier is read on a local miss and written on fetch."""
+        instagram_client._redis = MagicMock()
+        instagram_client._redis_get = AsyncMock(
+            side_effect=[({"data": "shared"}, 120), None]
+        )
+        instagram_client._redis_set = AsyncMock()
+        instagram_client.client.get = AsyncMock(
+            return_value=make_http_response(200, {"data": "fetched"})
+        )
+
+        # Shared hit: no API call, and the local cache is filled
+        result = await instagram_client._make_request("GET", "a", params={})
+        assert result == {"data": "shared"}
+        assert instagram_client.client.get.call_count == 0
+        key = instagram_client._get_cache_key("a", {})
+        assert instagram_client._cache.get(key) is not None
+
+        # Shared miss: fetched from the API and written back
+        result = await instagram_client._make_request("GET", "b", params={})
+        assert result == {"data": "fetched"}
+        instagram_client._redis_set.assert_awaited_once()
+
+        instagram_client._redis = None
+
+    @pytest.mark.asyncio
+    async def test_non_transient_errors_are_cached(self, instagram_client):
+        """Test that permanent API errors are cached briefly."""
+        mock_response = make_http_response(
+            200, {"error": {"message": "Invalid parameter", "code": 100}}
+        )
+
+        instagram_client.client.get = AsyncMock(return_value=mock_response)
+
+        for _ in range(2):
+            with pytest.raises(InstagramAPIError, match="Invalid parameter"):
+                await instagram_client._make_request("GET", "test_endpoint")
+
+        assert instagram_client.client.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_not_found_errors_are_cached(self, instagram_client):
+        """Test that 404 errors are cached even with an unlisted error code."""
+        mock_response = make_http_response(
+            404, {"error": {"message": "Media not found", "code": 1}}
+        )
+
+        instagram_client.client.get = AsyncMock(return_value=mock_response)
+
+        for _ in range(2):
+            with pytest.raises(InstagramAPIError, match="Media not found"):
+                await instagram_client._make_request("GET", "missing_media")
+
+        assert instagram_client.client.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_coalesced(self, instagram_client):
+        """Test that identical concurrent GETs share one HTTP request."""
+        mock_http_response = make_http_response(200, {"data": "test_data"})
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_http_response
+
+        instagram_client.client.get = AsyncMock(side_effect=slow_get)
+
+        results = await asyncio.gather(
+            *(
+                instagram_client._make_request(
+                    "GET", "test_endpoint", params={"param": "value"}
+                )
+                for _ in range(3)
+            )
+        )
+
+        assert results == [{"data": "test_data"}] * 3
+        assert instagram_client.client.get.call_count == 1
+        assert instagram_client._inflight == {}
+
+    def test_cache_evicts_least_recently_used(self, mock_settings):
+        """Test that the cache is bounded and evicts the oldest entries."""
+        mock_settings.cache_max_entries = 2
+        with patch("src.instagram_client.httpx.AsyncClient"):
+            client = InstagramClient()
+
+        client._cache_response("a", {"data": "a"})
+        client._cache_response("b", {"data": "b"})
+        client._cache_response("c", {"data": "c"})
+
+        assert list(client._cache) == ["b", "c"]
+
     @pytest.mark.asyncio
     async def test_close_client(self, instagram_client):
         """Test client cleanup."""
         await instagram_client.close()
         instagram_client.client.aclose.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_http_client_is_shared(self, mock_settings):
+        """Test that instances share one HTTP client until the last closes."""
+        first = InstagramClient()
+        second = InstagramClient()
+
+        assert first.client is second.client
+
+        await first.close()
+        assert not second.client.is_closed
+
+        await second.close()
+        assert second.client.is_closed
+
     @pytest.mark.asyncio
     async def test_context_manager(self, mock_settings):
         """Test async context manager usage."""
@@ -331,6 +792,19 @@ class TestInstagramClient:
             mock_client.aclose.assert_called_once()
 
 
+class TestAccessTokenAuth:
+    """Test cases for the access token auth flow."""
+
+    def test_token_added_to_query(self):
+        """Test that the token is merged into the request's query params."""
+        request = httpx.Request("GET", "https://example.com/me", params={"a": "1"})
+
+        signed = next(AccessTokenAuth("secret").auth_flow(request))
+
+        assert signed.url.params["a"] == "1"
+        assert signed.url.params["access_token"] == "secret"
+
+
 class TestInstagramAPIError:
     """Test cases for Instagram API error handling."""
 
@@ -352,6 +826,67 @@ class TestInstagramAPIError:
         assert error.error_subcode is None
 
 
+class TestTokenBucket:
+    """Test cases for the token bucket rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_waits_when_empty(self):
+        """Test that bursts up to capacity pass and then wait for refill."""
+        bucket = TokenBucket(2, period=0.1)
+
+        start = asyncio.get_running_loop().time()
+        for _ in range(3):
+            async with bucket:
+                pass
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert elapsed >= 0.04
+        assert bucket.tokens < 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_cost(self):
+        """Test that a call can take several tokens at once."""
+        bucket = TokenBucket(10, period=3600)
+
+        await bucket.acquire(4)
+        assert 5.9 < bucket.tokens <= 6.1
+
+        # A cost above capacity takes the whole bucket instead of waiting forever
+        bucket.tokens = 10
+        await bucket.acquire(50)
+        assert bucket.tokens < 1
+
+
+class TestParseImageSize:
+    """Test cases for reading image dimensions from headers."""
+
+    def test_png(self):
+        """Test PNG dimensions from the IHDR chunk."""
+        data = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + struct.pack(">II", 1080, 1350)
+
+        assert parse_image_size(data) == (1080, 1350)
+
+    def test_gif(self):
+        """Test GIF dimensions from the logical screen descriptor."""
+        data = b"GIF89a" + struct.pack("<HH", 1080, 1080)
+
+        assert parse_image_size(data) == (1080, 1080)
+
+    def test_jpeg(self):
+        """Test JPEG dimensions from the start-of-frame segment."""
+        app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + bytes(9)
+        sof0 = b"\xff\xc0" + struct.pack(">HBHH", 17, 8, 1000, 1910)
+        data = b"\xff\xd8" + app0 + sof0
+
+        assert parse_image_size(data) == (1910, 1000)
+        assert parse_image_size(data[:-2]) is None
+
+    def test_unsupported_format(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported image format"):
+            parse_image_size(b"<html>not an image</html>")
+
+
 class TestRateLimitExceeded:
     """Test cases for rate limit exception."""
 
@@ -361,3 +896,20 @@ class TestRateLimitExceeded:
 
         assert isinstance(error, InstagramAPIError)
         assert error.message == "Rate limit exceeded"
+
+
+class TestPublishMediaRequest:
+    """Test cases for publish request validation."""
+
+    def test_media_url_required(self):
+        """Test that a request without a media URL is rejected."""
+        with pytest.raises(ValueError, match="image_url or video_url"):
+            PublishMediaRequest(caption="No media")
+
+    def test_media_url_scheme(self):
+        """Test that media URLs must be HTTP(S)."""
+        request = PublishMediaRequest(video_url="https://example.com/video.mp4")
+        assert request.video_url == "https://example.com/video.mp4"
+
+        with pytest.raises(ValueError, match="http:// or https://"):
+            PublishMediaRequest(image_url="ftp://example.com/image.jpg")